@@ -8,16 +8,25 @@ This build shares dependencies with the main ralph project to avoid
 rebuilding libraries and ensure compatibility when linking.
 """
 
+import concurrent.futures
+import gzip
+import hashlib
 import os
 import sys
 import shutil
 import subprocess
 import tarfile
 import tempfile
+import urllib.error
+import urllib.request
+import zipfile
 from pathlib import Path
 
 # Configuration - matching superconfigure
 PYTHON_VERSION = "3.12.3"
+
+# Parallel build jobs - honor $JOBS, otherwise scale with the machine
+JOBS = int(os.environ.get("JOBS") or os.cpu_count() or 4)
 PYTHON_URL = f"https://github.com/python/cpython/archive/refs/tags/v{PYTHON_VERSION}.tar.gz"
 
 # Dependency versions - MUST match main Makefile
@@ -42,6 +51,41 @@ READLINE_LIB = READLINE_DIR / "libreadline.a"
 NCURSES_DIR = DEPS_DIR / f"ncurses-{NCURSES_VERSION}"
 NCURSES_LIB = NCURSES_DIR / "lib" / "libncurses.a"
 
+# Shared download cache - survives make clean and is shared across checkouts
+DOWNLOAD_CACHE_DIR = Path(
+    os.environ.get("XDG_CACHE_HOME", str(Path.home() / ".cache"))
+) / "ralph" / "downloads"
+
+# Fastest available tarball decompressor, picked once at import time
+TAR_DECOMPRESSOR = next(
+    (d for d in ("rapidgzip", "pigz") if shutil.which(d)), None
+)
+
+def _configure_argv(src_dir, lto, optimizations, install_dir, cflags, ldflags):
+    """Build the CPython configure argv (exec'd directly, no shell parse)."""
+    argv = [
+        str(src_dir / "configure"),
+        "--disable-shared",
+        "--disable-loadable-sqlite-extensions",
+        f"--with-lto={lto}",
+    ]
+    if optimizations:
+        argv.append(optimizations)
+    argv += [
+        "--without-system-expat",
+        "--with-pymalloc",
+        "--disable-test-modules",
+        "--with-tzpath=/zip/usr/share/zoneinfo",
+        f"--sysconfdir={install_dir}/share",
+        f"--datarootdir={install_dir}/share",
+        f"--prefix={install_dir}",
+        "ac_cv_file__dev_ptmx=yes",
+        "ac_cv_file__dev_ptc=no",
+        f"CFLAGS={cflags}",
+        f"LDFLAGS={ldflags}",
+    ]
+    return argv
+
 # Colors for output
 COLOR_RED = "\033[91m"
 COLOR_GREEN = "\033[92m"
@@ -54,24 +98,20 @@ def print_status(message, color=COLOR_BLUE):
     print(f"{color}{message}{COLOR_RESET}", flush=True)
 
 def run_command(cmd, cwd=None, env=None, capture_output=False):
-    """Run shell command with error handling."""
-    if capture_output:
-        result = subprocess.run(
-            cmd, 
-            shell=True, 
-            cwd=cwd, 
-            env=env, 
-            capture_output=True, 
-            text=True
-        )
-    else:
-        result = subprocess.run(
-            cmd, 
-            shell=True, 
-            cwd=cwd, 
-            env=env
-        )
-    
+    """Run a command with error handling.
+
+    Accepts an argv list (executed directly, no shell parse/fork) or a
+    string (run through the shell, for pipelines and multi-line commands).
+    """
+    result = subprocess.run(
+        cmd,
+        shell=isinstance(cmd, str),
+        cwd=cwd,
+        env=env,
+        capture_output=capture_output,
+        text=capture_output
+    )
+
     if result.returncode != 0:
         print_status(f"Error running: {cmd}", COLOR_RED)
         if capture_output and result.stderr:
@@ -82,17 +122,134 @@ def run_command(cmd, cwd=None, env=None, capture_output=False):
         return result.stdout
     return None
 
+def ccache_compiler_env():
+    """Return compiler env vars, wrapping cosmocc in ccache when available.
+
+    CCACHE_COMPILERCHECK=content is required because cosmocc is a shell
+    script wrapper whose mtime changes on reinstall but whose hash is stable.
+    """
+    if shutil.which("ccache"):
+        return {
+            "CC": "ccache cosmocc",
+            "CXX": "ccache cosmoc++",
+            "CCACHE_COMPILERCHECK": "content",
+            # Rewrite absolute include paths relative to the repo root so
+            # checkouts in different directories still share cache hits
+            "CCACHE_BASEDIR": str(RALPH_ROOT),
+        }
+    return {"CC": "cosmocc", "CXX": "cosmoc++"}
+
+def cosmocc_supports_lto():
+    """Probe whether cosmocc accepts -flto (it wraps gcc, but support varies)."""
+    result = subprocess.run(
+        "cosmocc -flto -x c -c /dev/null -o /dev/null",
+        shell=True,
+        capture_output=True
+    )
+    return result.returncode == 0
+
+def _etag_path(dest):
+    return Path(str(dest) + ".etag")
+
+def _revalidate_cached(url, dest):
+    """Check a cached download against upstream via If-None-Match.
+
+    GitHub's release URLs return stable ETags, so a 304 response proves
+    the cache is current for the cost of one header-only round-trip.
+    Returns True when the cache is current or can't be checked (offline).
+    """
+    etag_file = _etag_path(dest)
+    if not etag_file.exists():
+        return True  # Nothing recorded to compare against
+
+    req = urllib.request.Request(
+        url,
+        method="HEAD",
+        headers={"If-None-Match": etag_file.read_text().strip()}
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.headers.get("ETag", "") == etag_file.read_text().strip()
+    except urllib.error.HTTPError as e:
+        return e.code == 304
+    except OSError:
+        return True  # Offline or unreachable - trust the local file
+
+def _save_etag(url, dest):
+    """Record the upstream ETag so later runs can revalidate cheaply."""
+    try:
+        req = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            etag = resp.headers.get("ETag")
+            if etag:
+                _etag_path(dest).write_text(etag)
+    except OSError:
+        pass
+
+def _stream_download(url, dest):
+    """Stream a URL to disk in-process with resume support.
+
+    Avoids a subprocess fork/exec and an extra buffered copy through a
+    child process. Downloads into a .part sidecar (resumed via a Range
+    header when one exists) and renames into place atomically.
+    """
+    dest = Path(dest)
+    partial = Path(str(dest) + ".part")
+    offset = partial.stat().st_size if partial.exists() else 0
+
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        resp = urllib.request.urlopen(req, timeout=60)
+    except urllib.error.HTTPError as e:
+        if offset and e.code == 416:  # Range past EOF - already fully downloaded
+            os.replace(partial, dest)
+            return
+        raise
+
+    with resp:
+        mode = "ab" if resp.status == 206 else "wb"
+        with open(partial, mode, buffering=1 << 20) as f:
+            shutil.copyfileobj(resp, f, 1 << 20)
+
+    os.replace(partial, dest)
+
+def _download_cache_path(url, dest):
+    """Location of a URL's cached download, keyed by the URL hash."""
+    key = hashlib.sha256(url.encode()).hexdigest()[:16]
+    return DOWNLOAD_CACHE_DIR / key / Path(dest).name
+
+def _link_or_copy(src, dst):
+    """Hardlink src to dst, copying when they're on different devices."""
+    Path(dst).parent.mkdir(parents=True, exist_ok=True)
+    Path(dst).unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 def download_file(url, dest):
     """Download file from URL with progress."""
     if os.path.exists(dest):
         # Validate existing file based on type
         try:
             if str(dest).endswith('.tar.gz'):
-                # Validate tar.gz by attempting to open it
-                with tarfile.open(dest, 'r:gz') as _:
-                    pass
-                print_status(f"Using existing {dest}", COLOR_GREEN)
-                return
+                # Validate by gzip magic + trailer presence (the 8-byte
+                # CRC32/ISIZE trailer) instead of fully decompressing the
+                # stream - O(1) instead of O(decompressed size)
+                with open(dest, 'rb') as f:
+                    magic = f.read(2)
+                    f.seek(0, os.SEEK_END)
+                    size = f.tell()
+                if magic == b'\x1f\x8b' and size > 18:  # 10B header + 8B trailer
+                    if _revalidate_cached(url, dest):
+                        print_status(f"Using existing {dest}", COLOR_GREEN)
+                        return
+                    print_status("Upstream changed, re-downloading...", COLOR_YELLOW)
+                    os.remove(dest)
+                else:
+                    print_status("Corrupted tarball, re-downloading...", COLOR_YELLOW)
+                    os.remove(dest)
             elif dest.suffix == '.zip':
                 # Validate zip by checking header
                 with open(dest, 'rb') as f:
@@ -110,16 +267,95 @@ def download_file(url, dest):
             print_status("Corrupted file, re-downloading...", COLOR_YELLOW)
             os.remove(dest)
     
+    # Check the shared cache before touching the network - clean rebuilds
+    # and sibling checkouts reuse the same tarball
+    cached = _download_cache_path(url, dest)
+    if cached.exists():
+        print_status(f"Using cached download {cached}", COLOR_GREEN)
+        _link_or_copy(cached, dest)
+        return
+
     print_status(f"Downloading {url}...", COLOR_YELLOW)
     try:
-        # Use wget with resume capability for large files
-        cmd = f"wget --progress=bar:force -c -O {dest} {url}"
-        run_command(cmd)
+        if shutil.which("aria2c"):
+            # Multi-stream download beats single-stream on capped connections
+            dest = Path(dest)
+            run_command(["aria2c", "-x", "8", "-s", "8", "-c", "-q",
+                         "-o", dest.name, "-d", str(dest.parent), url])
+        else:
+            # In-process streaming download with resume, no wget dependency
+            _stream_download(url, dest)
+        _save_etag(url, dest)
+        _link_or_copy(dest, cached)
         print_status(f"Downloaded to {dest}", COLOR_GREEN)
     except Exception as e:
         print_status(f"Failed to download {url}: {e}", COLOR_RED)
         sys.exit(1)
 
+def stream_extract(url, tar_file, dest_dir):
+    """Download a tarball and extract it in one streaming pass.
+
+    tar's sequential format lets extraction run concurrently with the
+    download, so wall time is max(download, extract) instead of the sum.
+    The raw stream is teed to tar_file so later runs still find a cached
+    tarball. Returns False if no streaming fetcher is available or the
+    stream fails mid-flight (caller falls back to download-then-extract).
+    """
+    if shutil.which("curl"):
+        fetch_cmd = ["curl", "-fsSL", url]
+    elif shutil.which("wget"):
+        fetch_cmd = ["wget", "-qO-", url]
+    else:
+        return False
+
+    partial = Path(str(tar_file) + ".part")
+    proc = subprocess.Popen(fetch_cmd, stdout=subprocess.PIPE)
+    try:
+        with open(partial, "wb") as cache:
+            class _Tee:
+                """File-like wrapper that copies reads into the cache file."""
+                def read(self, n=-1):
+                    chunk = proc.stdout.read(n)
+                    if chunk:
+                        cache.write(chunk)
+                    return chunk
+
+            with tarfile.open(fileobj=_Tee(), mode="r|gz") as tar:
+                tar.extractall(dest_dir)
+
+        if proc.wait() != 0:
+            raise RuntimeError(f"download failed with exit code {proc.returncode}")
+    except Exception as e:
+        proc.kill()
+        proc.wait()
+        partial.unlink(missing_ok=True)
+        print_status(f"Streaming extract failed ({e}), falling back", COLOR_YELLOW)
+        return False
+
+    os.replace(partial, tar_file)
+    return True
+
+def extract_tarball(tar_file, dest_dir):
+    """Extract a .tar.gz, using a parallel decompressor when available.
+
+    Python's tarfile inflates the monolithic gzip stream single-threaded;
+    rapidgzip (and to a lesser degree pigz) spread decompression across
+    cores, which dominates extraction time once the tarball is cached.
+    """
+    if TAR_DECOMPRESSOR:
+        run_command(
+            f"{TAR_DECOMPRESSOR} -dc {tar_file} | tar -xf - -C {dest_dir}"
+        )
+        return
+
+    # Python-native fallback: stream straight through gzip into tarfile's
+    # pipe mode ("r|") - one sequential pass with 2 MiB buffers, no seeks
+    # back into the archive and no intermediate decompressed file
+    with open(tar_file, "rb", buffering=2 << 20) as raw, \
+            gzip.GzipFile(fileobj=raw) as gz, \
+            tarfile.open(fileobj=gz, mode="r|", bufsize=2 << 20) as tar:
+        tar.extractall(dest_dir, filter="data")
+
 def download_python_source():
     """Download and extract Python source."""
     LOCAL_BUILD_DIR.mkdir(exist_ok=True)
@@ -128,41 +364,130 @@ def download_python_source():
     if src_dir.exists():
         print_status("Python source already exists, skipping download", COLOR_GREEN)
         return src_dir
-    
+
     tar_file = LOCAL_BUILD_DIR / f"python-{PYTHON_VERSION}.tar.gz"
+
+    # Stream download directly into extraction when the tarball isn't cached
+    if not tar_file.exists():
+        print_status(f"Downloading and extracting {PYTHON_URL}...", COLOR_YELLOW)
+        if stream_extract(PYTHON_URL, tar_file, LOCAL_BUILD_DIR):
+            print_status("Python source ready", COLOR_GREEN)
+            return src_dir
+
     download_file(PYTHON_URL, tar_file)
 
     print_status("Extracting Python source...", COLOR_YELLOW)
-    with tarfile.open(tar_file, "r:gz") as tar:
-        tar.extractall(LOCAL_BUILD_DIR)
-    
+    extract_tarball(tar_file, LOCAL_BUILD_DIR)
+
     print_status("Python source ready", COLOR_GREEN)
     return src_dir
 
-def build_python(src_dir):
-    """Build Python using cosmocc fat compiler (produces both x86_64 and aarch64)."""
+def build_cache_key():
+    """Content hash of the inputs that determine the Python build output.
+
+    Keyed on the Python version, Setup.local, the cosmocc toolchain
+    version, the dependency identities linked into the interpreter, and
+    the PGO switch, so unchanged inputs map to an already-built tree.
+
+    Dependencies are keyed by pinned version plus presence, not by
+    hashing the built archives: configure (which computes this key)
+    overlaps with the zlib make on a cold build, so digesting libz.a
+    could read a half-written archive - and the completed lib would then
+    hash to a different key on the next run, discarding the cache
+    exactly when it should first hit.
+    """
+    h = hashlib.sha256()
+    h.update(PYTHON_VERSION.encode())
+    setup_local = Path("Setup.local")
+    if setup_local.exists():
+        h.update(setup_local.read_bytes())
+    try:
+        h.update(subprocess.check_output(["cosmocc", "--version"]))
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    h.update(f"zlib-{ZLIB_VERSION}".encode())
+    if READLINE_LIB.exists():
+        h.update(f"readline-{READLINE_VERSION}".encode())
+    if NCURSES_LIB.exists():
+        h.update(f"ncurses-{NCURSES_VERSION}".encode())
+    h.update(os.environ.get("ENABLE_PGO", "").encode())
+    return h.hexdigest()[:16]
+
+def _find_python_binaries(build_dir, install_dir):
+    """Locate the fat python binary and its arch-specific variants."""
+    python_bin = install_dir / "bin" / f"python{PYTHON_VERSION[:4]}"
+    if not python_bin.exists():
+        python_bin = install_dir / "bin" / "python3"
+
+    if not python_bin.exists():
+        print_status("Error: Python binary not found", COLOR_RED)
+        sys.exit(1)
+
+    # cosmocc also produces .com.dbg (x86_64) and .aarch64.elf alongside the fat binary
+    x86_64_bin = Path(str(python_bin) + ".com.dbg")
+    aarch64_bin = Path(str(python_bin) + ".aarch64.elf")
+
+    # If the arch-specific files don't exist in install dir, check build dir
+    if not x86_64_bin.exists():
+        build_python_bin = build_dir / "python"
+        x86_64_bin = Path(str(build_python_bin) + ".com.dbg")
+        aarch64_bin = Path(str(build_python_bin) + ".aarch64.elf")
+
+    return python_bin, x86_64_bin, aarch64_bin
+
+def configure_python(src_dir, incremental=False):
+    """Prepare and configure the CPython build tree.
+
+    Returns a state dict consumed by make_and_install_python. Kept separate
+    from the make phase so configure can overlap with the zlib build (the
+    two only meet at the Python link step).
+    """
     print_status("\nBuilding Python with cosmocc (fat binary)...", COLOR_BLUE)
 
-    build_dir = LOCAL_BUILD_DIR / "build"
-    install_dir = LOCAL_BUILD_DIR / "install"
+    # Content-addressed build tree: unchanged inputs reuse the cached build
+    key = build_cache_key()
+    build_dir = LOCAL_BUILD_DIR / f"build-{key}"
+    install_dir = LOCAL_BUILD_DIR / f"install-{key}"
+
+    # Prune trees keyed by superseded inputs - each stale pair holds a
+    # multi-GB CPython build that nothing will ever reuse
+    for prefix, keep in (("build-", build_dir.name),
+                         ("install-", install_dir.name)):
+        for stale in LOCAL_BUILD_DIR.glob(f"{prefix}*"):
+            if stale.name != keep and stale.is_dir():
+                print_status(f"Pruning stale cached tree {stale.name}",
+                             COLOR_YELLOW)
+                shutil.rmtree(stale, ignore_errors=True)
+
+    state = {"build_dir": build_dir, "install_dir": install_dir,
+             "env": None, "cached": False}
+
+    if build_dir.exists() and (install_dir / "bin" / "python3").exists():
+        print_status(f"Reusing cached Python build (key {key})", COLOR_GREEN)
+        state["cached"] = True
+        return state
+
+    # Incremental mode: keep the configured build tree and let make handle
+    # per-file recompilation (configure is the dominant cost on re-runs)
+    incremental = incremental and (build_dir / "Makefile").exists()
 
     # Clean and create directories
-    if build_dir.exists():
-        shutil.rmtree(build_dir)
-    build_dir.mkdir(parents=True)
+    if not incremental:
+        if build_dir.exists():
+            shutil.rmtree(build_dir)
+        build_dir.mkdir(parents=True)
     install_dir.mkdir(parents=True, exist_ok=True)
 
     # Setup environment - use cosmocc fat compiler
     env = os.environ.copy()
+    env.update(ccache_compiler_env())
     env.update({
-        "CC": "cosmocc",
-        "CXX": "cosmoc++",
         "AR": "cosmoar",
         "RANLIB": "cosmoranlib",
+        # Recursive sub-makes (e.g. CPython's Modules/) inherit the job count
+        "MAKEFLAGS": f"-j{JOBS}",
     })
 
-    print_status("Configuring Python...", COLOR_YELLOW)
-
     # Build include and library paths from shared deps
     include_paths = [f"-I{install_dir}/include", f"-I{ZLIB_DIR}"]
     lib_paths = [f"-L{install_dir}/lib", f"-L{ZLIB_DIR}"]
@@ -181,25 +506,30 @@ def build_python(src_dir):
     cflags = "-O2 " + " ".join(include_paths)
     ldflags = " ".join(lib_paths)
 
-    configure_cmd = f"""
-    {src_dir}/configure \
-        --disable-shared \
-        --disable-loadable-sqlite-extensions \
-        --with-lto=no \
-        --without-system-expat \
-        --with-pymalloc \
-        --disable-test-modules \
-        --with-tzpath=/zip/usr/share/zoneinfo \
-        --sysconfdir={install_dir}/share \
-        --datarootdir={install_dir}/share \
-        --prefix={install_dir} \
-        ac_cv_file__dev_ptmx=yes \
-        ac_cv_file__dev_ptc=no \
-        CFLAGS="{cflags}" \
-        LDFLAGS="{ldflags}"
-    """
+    if incremental:
+        print_status("Makefile exists, skipping configure (incremental)", COLOR_GREEN)
+    else:
+        print_status("Configuring Python...", COLOR_YELLOW)
+
+        # LTO improves interpreter dispatch in the resulting binary;
+        # only enable it when the cosmocc toolchain actually accepts -flto
+        lto = "thin" if cosmocc_supports_lto() else "no"
+        if lto != "no":
+            print_status("cosmocc supports LTO, enabling --with-lto=thin", COLOR_GREEN)
+
+        # PGO re-runs the just-built interpreter on a training workload;
+        # opt-in via ENABLE_PGO=1 since it roughly doubles build time
+        optimizations = "--enable-optimizations" if os.environ.get("ENABLE_PGO") == "1" else ""
+        if optimizations:
+            # Train on a single fast regrtest module instead of the full
+            # --pgo suite to keep the PGO pass within a sane time budget
+            env.setdefault("PROFILE_TASK", "-m test.regrtest --pgo test_builtin")
 
-    run_command(configure_cmd, cwd=build_dir, env=env)
+        run_command(
+            _configure_argv(src_dir, lto, optimizations, install_dir, cflags, ldflags),
+            cwd=build_dir,
+            env=env
+        )
 
     # Copy Setup.local if it exists
     modules_dir = build_dir / "Modules"
@@ -207,41 +537,79 @@ def build_python(src_dir):
         shutil.copy("Setup.local", modules_dir / "Setup.local")
         print_status("Applied Setup.local", COLOR_GREEN)
 
+    state["env"] = env
+    return state
+
+def make_and_install_python(state):
+    """Run the make/install phase on a tree prepared by configure_python."""
+    build_dir = state["build_dir"]
+    install_dir = state["install_dir"]
+    env = state["env"]
+
+    if state["cached"]:
+        copy_static_library(build_dir, install_dir, env=os.environ.copy())
+        python_bin, x86_64_bin, aarch64_bin = _find_python_binaries(build_dir, install_dir)
+        return python_bin, x86_64_bin, aarch64_bin, install_dir
+
     # Build
     print_status("Building Python...", COLOR_YELLOW)
-    run_command("make -j4", cwd=build_dir, env=env)
+    run_command(["make", "-s", f"-j{JOBS}"], cwd=build_dir, env=env)
 
     # Install
     print_status("Installing Python...", COLOR_YELLOW)
-    run_command("make install", cwd=build_dir, env=env)
+    run_command(["make", "-s", "install"], cwd=build_dir, env=env)
 
     # Copy static library to main ralph build directory for linking
-    copy_static_library(build_dir, install_dir)
+    copy_static_library(build_dir, install_dir, env=env)
 
     # Find the built python binary (fat APE) and its arch-specific variants
-    python_bin = install_dir / "bin" / f"python{PYTHON_VERSION[:4]}"
-    if not python_bin.exists():
-        python_bin = install_dir / "bin" / "python3"
+    python_bin, x86_64_bin, aarch64_bin = _find_python_binaries(build_dir, install_dir)
 
-    if not python_bin.exists():
-        print_status("Error: Python binary not found", COLOR_RED)
-        sys.exit(1)
+    print_status("Python built successfully", COLOR_GREEN)
+    return python_bin, x86_64_bin, aarch64_bin, install_dir
 
-    # cosmocc also produces .com.dbg (x86_64) and .aarch64.elf alongside the fat binary
-    x86_64_bin = Path(str(python_bin) + ".com.dbg")
-    aarch64_bin = Path(str(python_bin) + ".aarch64.elf")
+def build_python(src_dir, incremental=False):
+    """Build Python using cosmocc fat compiler (produces both x86_64 and aarch64)."""
+    return make_and_install_python(configure_python(src_dir, incremental=incremental))
 
-    # If the arch-specific files don't exist in install dir, check build dir
-    if not x86_64_bin.exists():
-        build_python_bin = build_dir / "python"
-        x86_64_bin = Path(str(build_python_bin) + ".com.dbg")
-        aarch64_bin = Path(str(build_python_bin) + ".aarch64.elf")
 
-    print_status("Python built successfully", COLOR_GREEN)
-    return python_bin, x86_64_bin, aarch64_bin, install_dir
+def copy_large_file(src, dst):
+    """Copy a large file, using a copy-on-write reflink when the FS supports it.
+
+    cp --reflink=auto (Linux) and cp -c (macOS clonefile) are zero-copy on
+    Btrfs/XFS/APFS and silently fall back to a normal copy elsewhere.
+    """
+    if sys.platform == "linux":
+        cmd = ["cp", "--reflink=auto", "-p", str(src), str(dst)]
+    elif sys.platform == "darwin":
+        cmd = ["cp", "-c", str(src), str(dst)]
+    else:
+        cmd = None
+
+    if cmd:
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode == 0:
+            return
+
+    shutil.copy2(src, dst)
 
 
-def copy_static_library(build_dir, install_dir):
+def _stat_fingerprint(path):
+    """mtime+size fingerprint of a file or tree (stat only, no reads)."""
+    if not path.exists():
+        return "missing"
+    if path.is_file():
+        st = path.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    parts = []
+    for f in sorted(path.rglob("*")):
+        if f.is_file():
+            st = f.stat()
+            parts.append(f"{f.relative_to(path)}:{st.st_mtime_ns}:{st.st_size}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def copy_static_library(build_dir, install_dir, env=None):
     """Copy libpython static library to main ralph build directory for linking.
 
     Creates a complete static library for embedding by:
@@ -272,34 +640,49 @@ def copy_static_library(build_dir, install_dir):
         print_status(f"Searched: {install_dir / 'lib'}, {build_dir}", COLOR_YELLOW)
         return
 
-    # Copy x86_64 library
     lib_dst_x86 = RALPH_BUILD_DIR / lib_name
-    shutil.copy2(lib_src_x86, lib_dst_x86)
-    print_status(f"Copied {lib_name} to {RALPH_BUILD_DIR}", COLOR_GREEN)
-
-    # Copy aarch64 library
-    if lib_src_aarch64.exists():
-        lib_dst_aarch64 = aarch64_dir / lib_name
-        shutil.copy2(lib_src_aarch64, lib_dst_aarch64)
-        print_status(f"Copied {lib_name} to {aarch64_dir}", COLOR_GREEN)
+    lib_dst_aarch64 = aarch64_dir / lib_name
+
+    # Skip the ~30MB copy + module-object append when the source libraries
+    # haven't changed since the last run (same stamp idea as embed_python)
+    lib_stamp = RALPH_BUILD_DIR / ".libpython-stamp"
+    lib_fp = f"{_stat_fingerprint(lib_src_x86)} {_stat_fingerprint(lib_src_aarch64)}"
+    if lib_dst_x86.exists() and lib_stamp.exists() \
+            and lib_stamp.read_text() == lib_fp:
+        print_status(f"{lib_name} unchanged, skipping copy", COLOR_GREEN)
     else:
-        print_status("Warning: aarch64 libpython not found", COLOR_YELLOW)
+        copy_large_file(lib_src_x86, lib_dst_x86)
+        print_status(f"Copied {lib_name} to {RALPH_BUILD_DIR}", COLOR_GREEN)
+
+        if lib_src_aarch64.exists():
+            copy_large_file(lib_src_aarch64, lib_dst_aarch64)
+            print_status(f"Copied {lib_name} to {aarch64_dir}", COLOR_GREEN)
+        else:
+            print_status("Warning: aarch64 libpython not found", COLOR_YELLOW)
 
-    # Add required module objects that aren't included in the base library
-    # These are needed for static linking/embedding
-    _add_module_objects_to_library(build_dir, lib_dst_x86, lib_dst_aarch64 if lib_src_aarch64.exists() else None)
+        # Add required module objects that aren't included in the base library
+        # These are needed for static linking/embedding
+        _add_module_objects_to_library(build_dir, lib_dst_x86, lib_dst_aarch64 if lib_src_aarch64.exists() else None, env=env)
+        lib_stamp.write_text(lib_fp)
 
     # Copy Python headers for ralph to include
     include_src = install_dir / "include" / f"python{py_version_short}"
     include_dst = RALPH_BUILD_DIR / "python-include"
     if include_src.exists():
-        if include_dst.exists():
-            shutil.rmtree(include_dst)
-        shutil.copytree(include_src, include_dst)
-        print_status(f"Copied Python headers to {include_dst}", COLOR_GREEN)
-
-
-def _add_module_objects_to_library(build_dir, lib_x86, lib_aarch64):
+        headers_stamp = RALPH_BUILD_DIR / ".python-headers-stamp"
+        headers_fp = _stat_fingerprint(include_src)
+        if include_dst.exists() and headers_stamp.exists() \
+                and headers_stamp.read_text() == headers_fp:
+            print_status("Python headers unchanged, skipping copy", COLOR_GREEN)
+        else:
+            if include_dst.exists():
+                shutil.rmtree(include_dst)
+            shutil.copytree(include_src, include_dst)
+            headers_stamp.write_text(headers_fp)
+            print_status(f"Copied Python headers to {include_dst}", COLOR_GREEN)
+
+
+def _add_module_objects_to_library(build_dir, lib_x86, lib_aarch64, env=None):
     """Add additional module objects to the static library for complete embedding.
 
     The base libpython doesn't include all objects needed for static linking.
@@ -336,6 +719,12 @@ def _add_module_objects_to_library(build_dir, lib_x86, lib_aarch64):
         tmpdir_aarch64 = tmpdir / ".aarch64"
         tmpdir_aarch64.mkdir()
 
+        # Collect objects from all groups, then issue a single cosmoar call -
+        # each ar invocation rewrites the whole (tens of MB) archive, so
+        # batching pays O(archive_size) once instead of once per group
+        all_objs = []
+        copy_pairs = []  # (src, dst) prefix-renames, copied in parallel below
+
         for subdir, obj_files, prefix in object_groups:
             obj_dir = modules_dir / subdir
             if not obj_dir.exists():
@@ -348,7 +737,6 @@ def _add_module_objects_to_library(build_dir, lib_x86, lib_aarch64):
             if prefix:
                 # For prefixed objects, copy both x86_64 and aarch64 to temp dir
                 # with matching names so cosmoar can find the pairs
-                x86_objs = []
                 for f in obj_files:
                     x86_src = obj_dir / f
                     prefixed_name = f"{prefix}{f}"
@@ -356,32 +744,30 @@ def _add_module_objects_to_library(build_dir, lib_x86, lib_aarch64):
                     if x86_src.exists():
                         # Copy x86_64 object
                         x86_dst = tmpdir / prefixed_name
-                        shutil.copy2(x86_src, x86_dst)
+                        copy_pairs.append((x86_src, x86_dst))
 
                         # Copy aarch64 object with same name to .aarch64 subdir
                         if has_aarch64:
                             aarch64_src = aarch64_obj_dir / f
                             if aarch64_src.exists():
-                                aarch64_dst = tmpdir_aarch64 / prefixed_name
-                                shutil.copy2(aarch64_src, aarch64_dst)
-
-                        x86_objs.append(str(x86_dst))
+                                copy_pairs.append((aarch64_src, tmpdir_aarch64 / prefixed_name))
 
-                if x86_objs:
-                    # cosmoar will automatically find .aarch64/ counterparts
-                    cmd = f"cosmoar r {lib_x86} " + " ".join(x86_objs)
-                    run_command(cmd)
+                        all_objs.append(str(x86_dst))
             else:
                 # For non-prefixed objects, use original paths directly
-                x86_objs = []
                 for f in obj_files:
                     src = obj_dir / f
                     if src.exists():
-                        x86_objs.append(str(src))
+                        all_objs.append(str(src))
+
+        if copy_pairs:
+            # Independent file copies - run them concurrently
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda pair: shutil.copy2(*pair), copy_pairs))
 
-                if x86_objs:
-                    cmd = f"cosmoar r {lib_x86} " + " ".join(x86_objs)
-                    run_command(cmd)
+        if all_objs:
+            # cosmoar will automatically find .aarch64/ counterparts
+            run_command(["cosmoar", "r", str(lib_x86)] + all_objs, env=env)
 
     print_status("Module objects added to static library", COLOR_GREEN)
 
@@ -409,6 +795,17 @@ _configure_paths()
 """
     return content
 
+def _stdlib_hash(lib_src):
+    """Content hash of the installed stdlib tree (paths + bytes)."""
+    if lib_src is None or not lib_src.exists():
+        return "missing"
+    h = hashlib.sha256()
+    for f in sorted(lib_src.rglob("*")):
+        if f.is_file():
+            h.update(str(f.relative_to(lib_src)).encode())
+            h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
 def create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir):
     """Create final fat binary with embedded standard library."""
     print_status("\nCreating final fat binary with embedded stdlib...", COLOR_BLUE)
@@ -424,9 +821,6 @@ def create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir):
     print_status("Preparing Python library...", COLOR_YELLOW)
 
     py_tmp = RESULTS_DIR / "py-tmp"
-    if py_tmp.exists():
-        shutil.rmtree(py_tmp)
-    py_tmp.mkdir()
 
     # Copy Python standard library from install dir
     # Use lib/python3.12/ structure to match Python's expected PYTHONHOME=/zip layout
@@ -434,9 +828,30 @@ def create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir):
     lib_src = install_dir / "lib" / f"python{py_version_short}"
     lib_dst = py_tmp / "lib" / f"python{py_version_short}"
 
-    if lib_src.exists():
+    # Skip the whole staging step (copy + compileall) when the install
+    # tree hasn't changed since the last run - same stamp idea as
+    # scripts/embed_python.py
+    stamp_file = RESULTS_DIR / ".py-tmp.stamp"
+    lib_hash = _stdlib_hash(lib_src)
+    if py_tmp.exists() and lib_dst.exists() and stamp_file.exists() \
+            and stamp_file.read_text() == lib_hash:
+        print_status("Python library unchanged, reusing staged tree", COLOR_GREEN)
+        lib_src = None  # Nothing to restage
+
+    if lib_src is not None and py_tmp.exists():
+        shutil.rmtree(py_tmp)
+    py_tmp.mkdir(exist_ok=True)
+
+    if lib_src is not None and lib_src.exists():
         lib_dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copytree(lib_src, lib_dst)
+        # Hardlink instead of copying bytes - compileall -b writes new .pyc
+        # siblings, so the install tree is never mutated through the links
+        try:
+            shutil.copytree(lib_src, lib_dst, copy_function=os.link)
+        except OSError:
+            # Cross-device link (EXDEV) - fall back to a real copy
+            shutil.rmtree(lib_dst, ignore_errors=True)
+            shutil.copytree(lib_src, lib_dst)
 
         # Add sitecustomize.py
         with open(lib_dst / "sitecustomize.py", "w") as f:
@@ -448,7 +863,18 @@ def create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir):
 
         # Compile Python modules using the fat binary
         print_status("Compiling Python modules...", COLOR_YELLOW)
-        run_command(f"{fat_python_bin} -m compileall -fqb ./lib", cwd=py_tmp)
+        run_command([str(fat_python_bin), "-m", "compileall", "-j", str(JOBS), "-fqb", "./lib"], cwd=py_tmp)
+
+        # The embedded zip only needs bytecode - drop each source .py whose
+        # sibling .pyc compiled (-b writes foo.pyc next to foo.py), roughly
+        # halving the stdlib footprint inside the APE. Keep the few modules
+        # that introspect their own source at runtime.
+        keep_source = {"inspect.py", "dis.py"}
+        for py_file in lib_dst.rglob("*.py"):
+            if py_file.name not in keep_source and py_file.with_suffix(".pyc").exists():
+                py_file.unlink()
+
+        stamp_file.write_text(lib_hash)
 
     # Step 2: Create final binary
     # If we have arch-specific binaries, use apelink to create a clean fat binary
@@ -463,8 +889,8 @@ def create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir):
         cosmocc_path = Path(ape_m1_result.stdout.strip())
         ape_m1 = cosmocc_path.parent / "ape-m1.c"
 
-        cmd = f"apelink -o {output_bin} -M {ape_m1} {x86_64_bin} {aarch64_bin}"
-        run_command(cmd)
+        run_command(["apelink", "-o", str(output_bin), "-M", str(ape_m1),
+                     str(x86_64_bin), str(aarch64_bin)])
     else:
         # Just copy the existing fat binary
         print_status("Copying fat binary...", COLOR_YELLOW)
@@ -475,10 +901,19 @@ def create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir):
     print_status("Adding libraries to fat binary...", COLOR_YELLOW)
 
     if (py_tmp / "lib").exists():
-        run_command(
-            f"zip -qr {output_bin.absolute()} lib/",
-            cwd=py_tmp
-        )
+        # Append in-process rather than shelling out to zip. The tree is
+        # almost entirely compiled .pyc, which barely deflates - store it
+        # raw and skip the single-threaded compression pass entirely.
+        with zipfile.ZipFile(output_bin, "a") as zf:
+            for f in sorted((py_tmp / "lib").rglob("*")):
+                if not f.is_file():
+                    continue
+                arcname = str(f.relative_to(py_tmp))
+                if f.suffix == ".pyc":
+                    zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(f, arcname, compress_type=zipfile.ZIP_DEFLATED,
+                             compresslevel=1)
 
     # Make executable
     os.chmod(output_bin, 0o755)
@@ -486,18 +921,10 @@ def create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir):
     print_status(f"Fat binary created: {output_bin}", COLOR_GREEN)
     return output_bin
 
-def build_zlib():
-    """Build zlib using cosmocc - shared with main ralph project."""
-    # Check if already built by main Makefile
-    if ZLIB_LIB.exists():
-        print_status(f"Using existing zlib from {ZLIB_DIR}", COLOR_GREEN)
-        return
-
-    print_status("Building zlib...", COLOR_YELLOW)
-
+def download_zlib_tarball():
+    """Download the zlib source tarball if it isn't cached yet."""
     DEPS_DIR.mkdir(exist_ok=True)
 
-    # Download zlib if needed
     zlib_tar = DEPS_DIR / f"zlib-{ZLIB_VERSION}.tar.gz"
     # Use GitHub mirror as zlib.net can be unreliable
     zlib_url = f"https://github.com/madler/zlib/releases/download/v{ZLIB_VERSION}/zlib-{ZLIB_VERSION}.tar.gz"
@@ -506,29 +933,52 @@ def build_zlib():
         print_status(f"Downloading zlib v{ZLIB_VERSION}...", COLOR_YELLOW)
         download_file(zlib_url, zlib_tar)
 
-    # Extract zlib
+    return zlib_tar
+
+def ensure_zlib_source():
+    """Download and extract the zlib source tree.
+
+    Split out of build_zlib because the headers must exist before CPython's
+    configure runs, even though libz.a itself is only needed at link time.
+    """
+    if ZLIB_LIB.exists():
+        return
+
+    zlib_tar = download_zlib_tarball()
+
     if not ZLIB_DIR.exists():
         print_status("Extracting zlib...", COLOR_YELLOW)
-        with tarfile.open(zlib_tar, "r:gz") as tar:
-            tar.extractall(DEPS_DIR)
+        extract_tarball(zlib_tar, DEPS_DIR)
+
+def build_zlib():
+    """Build zlib using cosmocc - shared with main ralph project."""
+    # Check if already built by main Makefile
+    if ZLIB_LIB.exists():
+        print_status(f"Using existing zlib from {ZLIB_DIR}", COLOR_GREEN)
+        return
+
+    print_status("Building zlib...", COLOR_YELLOW)
+
+    ensure_zlib_source()
 
     # Setup environment for cosmocc - same as main Makefile
     env = os.environ.copy()
-    env.update({
-        "CC": "cosmocc",
-        "CFLAGS": "-O2",
-    })
+    env.update(ccache_compiler_env())
+    env["CFLAGS"] = "-O2"
 
-    # Configure and build zlib
-    print_status("Configuring zlib...", COLOR_YELLOW)
-    run_command(
-        "./configure --static",
-        cwd=ZLIB_DIR,
-        env=env
-    )
+    # Configure and build zlib (skip configure if already configured)
+    if (ZLIB_DIR / "Makefile").exists():
+        print_status("zlib already configured, skipping configure", COLOR_GREEN)
+    else:
+        print_status("Configuring zlib...", COLOR_YELLOW)
+        run_command(
+            ["./configure", "--static"],
+            cwd=ZLIB_DIR,
+            env=env
+        )
 
     print_status("Building zlib...", COLOR_YELLOW)
-    run_command("make -j4 CC=cosmocc", cwd=ZLIB_DIR, env=env)
+    run_command(["make", "-s", f"-j{JOBS}", f"CC={env['CC']}"], cwd=ZLIB_DIR, env=env)
 
     if not ZLIB_LIB.exists():
         print_status("Error: zlib build failed", COLOR_RED)
@@ -540,16 +990,30 @@ def main():
     """Main build process."""
     print_status("=== Cosmopolitan Python Build ===\n", COLOR_BLUE)
 
-    # Download Python source
-    src_dir = download_python_source()
+    incremental = "--incremental" in sys.argv[1:]
 
-    # Build zlib (shared with main ralph project)
+    # Download Python and zlib sources concurrently - the two GitHub
+    # fetches are independent, so overlap them on cold checkouts
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        src_future = pool.submit(download_python_source)
+        zlib_future = pool.submit(download_zlib_tarball) if not ZLIB_LIB.exists() else None
+        src_dir = src_future.result()
+        if zlib_future:
+            zlib_future.result()
+
+    # Build zlib (shared with main ralph project), overlapping its make
+    # with CPython's configure - the two are independent until the Python
+    # link step, and the zlib headers are extracted before configure starts
     print_status("\n=== Building Dependencies ===", COLOR_BLUE)
-    build_zlib()
+    ensure_zlib_source()
 
-    # Build Python with cosmocc (produces fat binary for both architectures)
     print_status("\n=== Building Python ===", COLOR_BLUE)
-    fat_python_bin, x86_64_bin, aarch64_bin, install_dir = build_python(src_dir)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        zlib_future = pool.submit(build_zlib)
+        state = pool.submit(configure_python, src_dir, incremental).result()
+        zlib_future.result()
+
+    fat_python_bin, x86_64_bin, aarch64_bin, install_dir = make_and_install_python(state)
 
     # Create final fat binary with embedded stdlib
     fat_binary = create_fat_binary(fat_python_bin, x86_64_bin, aarch64_bin, install_dir)
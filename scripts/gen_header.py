@@ -10,6 +10,9 @@ Uses compare-and-swap: only writes when content changes.
 Usage: gen_header.py <output-file>
 """
 
+import functools
+import hashlib
+import os
 import re
 import sys
 from pathlib import Path
@@ -71,9 +74,13 @@ def main():
 
     visited: set[Path] = set()
 
-    def resolve(inc_name: str, from_file: Path, is_quoted: bool) -> Path | None:
-        if is_quoted:
-            candidate = (from_file.parent / inc_name).resolve()
+    # Memoized: the same header is #included from hundreds of call sites,
+    # and each miss costs a stat per search path. Keyed on the quoted-search
+    # parent dir (None for <...>), so N x M lookups collapse to M.
+    @functools.lru_cache(maxsize=None)
+    def resolve(inc_name: str, parent: Path | None) -> Path | None:
+        if parent is not None:
+            candidate = (parent / inc_name).resolve()
             if candidate.is_file():
                 return candidate
         for sp in search_paths:
@@ -100,30 +107,41 @@ def main():
         if emit:
             result.append(f"/* --- {rel(filepath)} --- */")
 
-        for line in filepath.read_text().splitlines():
-            m = INCLUDE_RE.match(line)
-            if not m:
-                if emit:
+        # Stream line-by-line rather than materializing each header with
+        # read_text().splitlines() - the lib tree adds up to tens of MB
+        with filepath.open("r", buffering=1 << 16) as fp:
+            for raw in fp:
+                line = raw.rstrip("\n")
+                # Fast path: almost no lines are preprocessor directives, so
+                # a cheap startswith check skips the regex engine for the rest
+                if not line.lstrip().startswith("#"):
+                    if emit:
+                        result.append(line)
+                    continue
+
+                m = INCLUDE_RE.match(line)
+                if not m:
+                    if emit:
+                        result.append(line)
+                    continue
+
+                bracket, inc_name = m.group(1), m.group(2)
+                is_quoted = bracket == '"'
+
+                if inc_name in SYSTEM_HEADERS:
+                    if emit:
+                        result.append(line)
+                    continue
+
+                resolved = resolve(inc_name, filepath.parent if is_quoted else None)
+                if resolved:
+                    result.extend(expand(resolved))
+                elif str(filepath).startswith(str(root / "lib")):
+                    print(f"error: cannot resolve #include {bracket}{inc_name}{'>' if bracket == '<' else '\"'} "
+                          f"from {rel(filepath)}", file=sys.stderr)
+                    sys.exit(1)
+                elif emit:
                     result.append(line)
-                continue
-
-            bracket, inc_name = m.group(1), m.group(2)
-            is_quoted = bracket == '"'
-
-            if inc_name in SYSTEM_HEADERS:
-                if emit:
-                    result.append(line)
-                continue
-
-            resolved = resolve(inc_name, filepath, is_quoted)
-            if resolved:
-                result.extend(expand(resolved))
-            elif str(filepath).startswith(str(root / "lib")):
-                print(f"error: cannot resolve #include {bracket}{inc_name}{'>' if bracket == '<' else '\"'} "
-                      f"from {rel(filepath)}", file=sys.stderr)
-                sys.exit(1)
-            elif emit:
-                result.append(line)
 
         if emit:
             result.append("")
@@ -171,9 +189,20 @@ def main():
     content = "\n".join(out)
 
     outfile.parent.mkdir(parents=True, exist_ok=True)
-    if outfile.exists() and outfile.read_text() == content:
+
+    # Compare-and-swap against a hash sidecar: the no-op path hashes the
+    # new content instead of re-reading the multi-MB old header
+    new_hash = hashlib.sha256(content.encode()).hexdigest()
+    sidecar = outfile.with_suffix(outfile.suffix + ".sha256")
+    if outfile.exists() and sidecar.exists() \
+            and sidecar.read_text().strip() == new_hash:
         return
-    outfile.write_text(content)
+
+    # Atomic swap so a partially written header is never observed by make
+    tmp = outfile.with_suffix(outfile.suffix + ".tmp")
+    tmp.write_text(content)
+    os.replace(tmp, outfile)
+    sidecar.write_text(new_hash)
 
 
 if __name__ == "__main__":
@@ -13,28 +13,21 @@ architecture archives independently.
 Usage: merge_fat_archive.py OUTPUT INPUT_A [INPUT_A ...]
 """
 
+import concurrent.futures
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
 
 def merge_archives(output: Path, inputs: list[Path]) -> None:
-    """Merge multiple .a files into one using GNU ar MRI script."""
-    mri_path = None
-    try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".mri", delete=False) as f:
-            f.write(f"CREATE {output}\n")
-            for lib in inputs:
-                f.write(f"ADDLIB {lib}\n")
-            f.write("SAVE\nEND\n")
-            mri_path = f.name
-
-        with open(mri_path) as mri_file:
-            subprocess.check_call(["ar", "-M"], stdin=mri_file)
-    finally:
-        if mri_path:
-            Path(mri_path).unlink(missing_ok=True)
+    """Merge multiple .a files into one using GNU ar MRI script.
+
+    The script is piped straight to ar's stdin - no temp file round-trip.
+    """
+    script = f"CREATE {output}\n" \
+        + "".join(f"ADDLIB {lib}\n" for lib in inputs) \
+        + "SAVE\nEND\n"
+    subprocess.run(["ar", "-M"], input=script, text=True, check=True)
 
 
 def main() -> None:
@@ -45,10 +38,7 @@ def main() -> None:
     output = Path(sys.argv[1])
     inputs = [Path(a) for a in sys.argv[2:]]
 
-    # Merge x86_64 archives
-    merge_archives(output, inputs)
-
-    # Merge aarch64 archives (parallel .aarch64/ tree)
+    # aarch64 archives live in a parallel .aarch64/ tree
     aarch64_output = output.parent / ".aarch64" / output.name
     aarch64_inputs = [a.parent / ".aarch64" / a.name for a in inputs]
 
@@ -58,7 +48,16 @@ def main() -> None:
         sys.exit(1)
 
     aarch64_output.parent.mkdir(parents=True, exist_ok=True)
-    merge_archives(aarch64_output, aarch64_inputs)
+
+    # The two ar -M runs are independent subprocesses - merge both
+    # architectures concurrently so wall time is the slower of the two
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [
+            pool.submit(merge_archives, output, inputs),
+            pool.submit(merge_archives, aarch64_output, aarch64_inputs),
+        ]
+        for future in futures:
+            future.result()
 
 
 if __name__ == "__main__":
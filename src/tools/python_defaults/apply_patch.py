@@ -4,9 +4,24 @@ Gate: file_write
 Match: patch
 """
 
+import functools
+import mmap
+import os
+from operator import itemgetter
+from pathlib import Path
 
+MAX_PATCH_FILE = 50 * 1024 * 1024  # 50MB
+
+
+@functools.lru_cache(maxsize=1024)
 def _is_traversal_path(path: str) -> bool:
-    """Check if path contains directory traversal attempts."""
+    """Check if path contains directory traversal attempts.
+
+    Cached - agent loops hit the same handful of paths over and over
+    (read, patch, re-read), so repeat checks are a dict hit.
+    """
+    if '..' not in path:
+        return False
     parts = path.replace('\\', '/').split('/')
     return '..' in parts
 
@@ -165,17 +180,20 @@ def _apply_hunk(lines, hunk_lines, file_path):
         replacements.append((found, len(old), new))
         line_index = found + len(old)
 
-    # Apply replacements in reverse order so indices stay valid
-    for start_idx, old_len, new_segment in reversed(replacements):
-        # Remove old lines
-        del lines[start_idx:start_idx + old_len]
-        # Insert new lines (with newline endings)
-        for offset, nl in enumerate(new_segment):
-            if not nl.endswith('\n'):
-                nl += '\n'
-            lines.insert(start_idx + offset, nl)
-
-    return lines
+    # Replacement spans are non-overlapping and generated front-to-back
+    # (line_index only advances), so the result can be assembled in one
+    # pass: copy the untouched gaps between spans and splice in each new
+    # segment, rather than mutating the list with per-line insert() calls
+    replacements.sort(key=itemgetter(0))
+    result = []
+    prev = 0
+    for start_idx, old_len, new_segment in replacements:
+        result.extend(lines[prev:start_idx])
+        result.extend(nl if nl.endswith('\n') else nl + '\n'
+                      for nl in new_segment)
+        prev = start_idx + old_len
+    result.extend(lines[prev:])
+    return result
 
 
 def apply_patch(patch: str) -> dict:
@@ -208,8 +226,6 @@ def apply_patch(patch: str) -> dict:
     Returns:
         Dictionary with success status and list of files modified
     """
-    from pathlib import Path
-
     if not patch or not patch.strip():
         raise ValueError("Empty patch provided")
 
@@ -221,6 +237,12 @@ def apply_patch(patch: str) -> dict:
     current_lines = []
 
     for line in lines:
+        # Fast path: almost every line is hunk content, so one prefix
+        # check replaces the five directive comparisons below
+        if not line.startswith('*** '):
+            current_lines.append(line)
+            continue
+
         if line.startswith('*** Begin Patch'):
             continue
         elif line.startswith('*** End Patch'):
@@ -304,7 +326,25 @@ def apply_patch(patch: str) -> dict:
             if not p.is_file():
                 raise ValueError(f"Not a file: {file_path}")
 
-            file_content = p.read_text(encoding='utf-8')
+            # Metadata-only size gate before allocating anything
+            size = p.stat().st_size
+            if size > MAX_PATCH_FILE:
+                raise ValueError(
+                    f"File too large to patch (>{MAX_PATCH_FILE} bytes): {file_path}")
+
+            # Decode straight out of the page cache for big files - mmap
+            # skips read()'s intermediate whole-file bytes copy
+            with open(p, 'rb') as bf:
+                if os.fstat(bf.fileno()).st_size > 64 * 1024:
+                    try:
+                        mm = mmap.mmap(bf.fileno(), 0, access=mmap.ACCESS_READ)
+                    except (ValueError, OSError):
+                        file_content = bf.read().decode('utf-8')
+                    else:
+                        with mm:
+                            file_content = str(mm, 'utf-8')
+                else:
+                    file_content = bf.read().decode('utf-8')
             file_lines = file_content.splitlines(keepends=True)
             # Ensure last line has newline
             if file_lines and not file_lines[-1].endswith('\n'):
@@ -318,8 +358,11 @@ def apply_patch(patch: str) -> dict:
             if hunk_lines:
                 file_lines = _apply_hunk(file_lines, hunk_lines, file_path)
 
-            result_content = ''.join(file_lines)
-            p.write_text(result_content, encoding='utf-8')
+            # writelines streams the per-line strings through the file's
+            # buffer in large batched writes - no join() materializing a
+            # second whole-file string first
+            with open(p, 'w', encoding='utf-8') as f:
+                f.writelines(file_lines)
             files_modified.append(file_path)
             details.append(f"Updated {file_path}")
 
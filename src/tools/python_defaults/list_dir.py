@@ -4,14 +4,46 @@ Gate: file_read
 Match: path
 """
 
+import fnmatch
+import functools
+import os
+import re
+import stat
+import time
+from pathlib import Path
 
+# Directories to skip in recursive mode
+_SKIP_DIRS = frozenset({'.git', '.svn', '.hg', 'node_modules', '__pycache__',
+                        '.cache', 'build', 'dist', 'deps', 'vendor',
+                        '.venv', 'venv'})
+
+
+def _format_iso_utc(ts: float) -> str:
+    """Format a timestamp as ISO-8601 UTC without building a datetime.
+
+    datetime.fromtimestamp + isoformat allocates a datetime and dispatches
+    through tzinfo per entry; struct_time plus one f-string is ~10x cheaper
+    on this per-entry hot path.
+    """
+    tm = time.gmtime(ts)
+    return (f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+            f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}+00:00")
+
+
+@functools.lru_cache(maxsize=1024)
 def _is_traversal_path(path: str) -> bool:
-    """Check if path contains directory traversal attempts."""
+    """Check if path contains directory traversal attempts.
+
+    Cached - agent loops hit the same handful of paths over and over
+    (read, patch, re-read), so repeat checks are a dict hit.
+    """
+    if '..' not in path:
+        return False
     parts = path.replace('\\', '/').split('/')
     return '..' in parts
 
 
-def list_dir(path: str, glob_filter: str = None, recursive: bool = False, include_hidden: bool = False) -> list:
+def list_dir(path: str, glob_filter: str = None, recursive: bool = False, include_hidden: bool = False, include_stat: bool = True) -> list:
     """List directory contents with optional glob filtering. Use to explore project structure or find files by name/extension. For finding files by content, use search_files instead.
 
     Args:
@@ -19,14 +51,13 @@ def list_dir(path: str, glob_filter: str = None, recursive: bool = False, includ
         glob_filter: Optional glob pattern to filter results (e.g., "*.py", "*.txt")
         recursive: Whether to list recursively (default: False)
         include_hidden: Whether to include hidden files starting with . (default: False)
+        include_stat: Whether to include size/modified_time, which cost a
+            stat() per entry; False returns name/path/is_directory only,
+            served straight from the directory listing (default: True)
 
     Returns:
         List of dictionaries with file/directory information
     """
-    from pathlib import Path
-    from datetime import datetime, timezone
-    import os
-
     # Security check - prevent directory traversal
     if _is_traversal_path(path):
         raise ValueError("Invalid path: directory traversal not allowed")
@@ -42,77 +73,186 @@ def list_dir(path: str, glob_filter: str = None, recursive: bool = False, includ
     results = []
     max_entries = 1000
 
-    # Directories to skip in recursive mode
-    skip_dirs = {'.git', '.svn', '.hg', 'node_modules', '__pycache__',
-                 '.cache', 'build', 'dist', 'deps', 'vendor', '.venv', 'venv'}
-
-    def should_include(entry_path):
-        name = entry_path.name
-        if not include_hidden and name.startswith('.'):
-            return False
-        return True
+    def should_include(name):
+        return include_hidden or not name.startswith('.')
 
-    def add_entry(entry_path):
+    def append_result(name, path_str, is_dir, st):
         if len(results) >= max_entries:
             return False
-
-        try:
-            stat = entry_path.stat()
-            mtime_iso = datetime.fromtimestamp(
-                stat.st_mtime, tz=timezone.utc
-            ).isoformat()
+        if st is None:
             results.append({
-                "name": entry_path.name,
-                "path": str(entry_path),
-                "is_directory": entry_path.is_dir(),
-                "size": stat.st_size if not entry_path.is_dir() else 0,
-                "modified_time": mtime_iso
+                "name": name,
+                "path": path_str,
+                "is_directory": is_dir
             })
             return True
+        results.append({
+            "name": name,
+            "path": path_str,
+            "is_directory": is_dir,
+            "size": st.st_size if not is_dir else 0,
+            "modified_time": _format_iso_utc(st.st_mtime)
+        })
+        return True
+
+    def add_entry(entry):
+        """Add an os.DirEntry - type and stat come from the DirEntry cache
+        (d_type from getdents where available), not fresh stat() syscalls.
+        With include_stat=False the type alone suffices and no stat is
+        ever issued."""
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            st = entry.stat(follow_symlinks=False) if include_stat else None
         except (PermissionError, OSError):
             return True  # Continue even if we can't stat this entry
+        return append_result(entry.name, entry.path, is_dir, st)
+
+    def add_path_entry(entry_path):
+        """Add a pathlib.Path (glob results) - one stat() serves both the
+        metadata and the directory check via S_ISDIR."""
+        try:
+            st = os.stat(entry_path, follow_symlinks=False)
+        except (PermissionError, OSError):
+            return True
+        is_dir = stat.S_ISDIR(st.st_mode)
+        return append_result(entry_path.name, str(entry_path), is_dir,
+                             st if include_stat else None)
+
+    def add_fd_entry(name, dfd, parent_str, is_dir):
+        """Add by name relative to an open directory fd - the kernel skips
+        re-resolving every path component on each stat. The walker already
+        knows the entry type, so include_stat=False skips the stat."""
+        if not include_stat:
+            return append_result(name, os.path.join(parent_str, name),
+                                 is_dir, None)
+        try:
+            st = os.stat(name, dir_fd=dfd, follow_symlinks=False)
+        except (PermissionError, OSError):
+            return True
+        return append_result(name, os.path.join(parent_str, name),
+                             stat.S_ISDIR(st.st_mode), st)
 
     if recursive:
-        if glob_filter:
+        if glob_filter and '/' not in glob_filter and '**' not in glob_filter:
+            # Prune the walk itself rather than filtering rglob's output -
+            # rglob would stat every entry under .git/node_modules first.
+            # Simple name patterns compile once via fnmatch.translate
+            match = re.compile(fnmatch.translate(glob_filter)).match
+            stack = [str(p)]
+            while stack and len(results) < max_entries:
+                current = stack.pop()
+                try:
+                    it = os.scandir(current)
+                except (PermissionError, OSError):
+                    continue
+                with it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if is_dir and entry.name in _SKIP_DIRS:
+                            continue
+                        if should_include(entry.name) and match(entry.name):
+                            if not add_entry(entry):
+                                break
+                        if is_dir:
+                            stack.append(entry.path)
+        elif glob_filter:
+            # Path-shaped patterns (dir/*.py, **/x) keep pathlib's matcher
             for entry in p.rglob(glob_filter):
-                if not should_include(entry):
+                if not should_include(entry.name):
                     continue
                 # Skip common non-essential directories
                 parts = entry.parts
-                if any(skip in parts for skip in skip_dirs):
+                if any(skip in parts for skip in _SKIP_DIRS):
                     continue
-                if not add_entry(entry):
+                if not add_path_entry(entry):
                     break
-        else:
-            for root, dirs, files in os.walk(p):
-                root_path = Path(root)
-
+        elif hasattr(os, 'fwalk'):
+            # fwalk hands us an open fd for each directory, so every stat
+            # is a single dirfd-relative lookup instead of a full path
+            # resolution from the mount root
+            for root, dirs, files, dfd in os.fwalk(p):
                 # Filter out directories we want to skip
-                dirs[:] = [d for d in dirs if d not in skip_dirs and
-                          (include_hidden or not d.startswith('.'))]
+                dirs[:] = [d for d in dirs if d not in _SKIP_DIRS and
+                           should_include(d)]
 
                 for name in files:
-                    if not include_hidden and name.startswith('.'):
+                    if not should_include(name):
                         continue
-                    if not add_entry(root_path / name):
+                    if not add_fd_entry(name, dfd, root, False):
                         break
 
                 for name in dirs:
-                    if not add_entry(root_path / name):
+                    if not add_fd_entry(name, dfd, root, True):
                         break
 
                 if len(results) >= max_entries:
                     break
+        else:
+            # No fwalk (Windows): stack-based scandir walk, DirEntry
+            # objects flow straight to add_entry with cached type/stat
+            stack = [str(p)]
+            while stack and len(results) < max_entries:
+                current = stack.pop()
+                try:
+                    it = os.scandir(current)
+                except (PermissionError, OSError):
+                    continue
+                with it:
+                    for entry in it:
+                        if not should_include(entry.name):
+                            continue
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if is_dir and entry.name in _SKIP_DIRS:
+                            continue
+                        if not add_entry(entry):
+                            break
+                        if is_dir:
+                            stack.append(entry.path)
     else:
-        if glob_filter:
+        # Group directories first. The sort key must classify entries the
+        # same way the reported is_directory field does (no symlink
+        # following), or a symlink to a directory sorts with the dirs
+        # while being labeled a file
+        def direntry_key(e):
+            try:
+                is_dir = e.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            return (not is_dir, e.name.lower())
+
+        def path_key(e):
+            try:
+                is_dir = stat.S_ISDIR(os.lstat(e).st_mode)
+            except OSError:
+                is_dir = False
+            return (not is_dir, e.name.lower())
+
+        if glob_filter and '/' not in glob_filter and '**' not in glob_filter:
+            # One precompiled regex filters the scandir listing instead of
+            # pathlib recompiling the glob per call
+            match = re.compile(fnmatch.translate(glob_filter)).match
+            entries = [e for e in os.scandir(p) if match(e.name)]
+            add = add_entry
+            sort_key = direntry_key
+        elif glob_filter:
             entries = list(p.glob(glob_filter))
+            add = add_path_entry
+            sort_key = path_key
         else:
-            entries = list(p.iterdir())
+            entries = list(os.scandir(p))
+            add = add_entry
+            sort_key = direntry_key
 
-        for entry in sorted(entries, key=lambda x: (not x.is_dir(), x.name.lower())):
-            if not should_include(entry):
+        for entry in sorted(entries, key=sort_key):
+            if not should_include(entry.name):
                 continue
-            if not add_entry(entry):
+            if not add(entry):
                 break
 
     return results
@@ -3,6 +3,7 @@
 Gate: network
 """
 
+import functools
 import os
 import re
 import tempfile
@@ -11,6 +12,13 @@ import zipfile
 
 _MAX_DEPTH = 10
 
+# Patterns compiled once at module scope
+_NORMALIZE_RE = re.compile(r'[-_.]+')
+_DEP_NAME_RE = re.compile(r'^([A-Za-z0-9][-A-Za-z0-9_.]*)')
+_DEP_VER_RE = re.compile(r'==\s*([^\s,;\]]+)')
+_SEG_RE = re.compile(r'^(\d+)(.*)')
+_TAG_RE = re.compile(r'^(dev|alpha|beta|a|b|rc)(\d*)', re.I)
+
 
 def pip(action: str = "install", package: str = None, version: str = None, force: bool = False) -> dict:
     """Install or list pure-Python packages in scaffold's embedded interpreter. Only works with pure-Python wheels (no C extensions). Use action='install' with a package name, or action='list' to see installed packages.
@@ -43,6 +51,9 @@ def _do_install(package, version, force):
 
     Only supports pure-Python (py3-none-any) wheels. C extensions are rejected.
     """
+    import concurrent.futures
+    import shutil
+
     import _ralph_http
     import _ralph_sys
 
@@ -59,57 +70,97 @@ def _do_install(package, version, force):
     installed = []
     errors = []
     seen = set()
+    # One scan of site-packages up front; each METADATA is parsed once
+    # instead of per _is_installed/_get_version/_get_dependencies call
+    index = _build_index(site_packages)
 
-    def _install_one(name, ver=None, depth=0):
-        if depth > _MAX_DEPTH:
-            errors.append(f"Dependency depth limit exceeded for '{name}'")
-            return
-
-        norm = _normalize(name)
-        if norm in seen:
-            return
-        seen.add(norm)
-
-        if not force and _is_installed(name, site_packages):
-            return
+    def _fetch_one(name, ver):
+        """Network stage: resolve and download the best wheel for a package.
 
+        Returns (tmpdir, wheel_path, error) - exactly one of wheel_path
+        and error is set. Pure network + temp-file work, safe to run on
+        a thread pool.
+        """
         simple_url = f"https://pypi.org/simple/{name}/"
         resp = _ralph_http.get(simple_url, headers=["Accept: text/html"], timeout=30)
         if not resp.get("ok"):
-            errors.append(f"Failed to fetch package index for '{name}': HTTP {resp.get('status', 0)}")
-            return
+            return None, None, f"Failed to fetch package index for '{name}': HTTP {resp.get('status', 0)}"
 
-        html = resp.get("data", "")
-        wheel_url, wheel_filename = _find_best_wheel(html, name, ver)
+        wheel_url, wheel_filename = _find_best_wheel(resp.get("data", ""), name, ver)
         if wheel_url is None:
-            errors.append(f"No compatible wheel found for '{name}'" +
-                         (f" version {ver}" if ver else "") +
-                         ". Only pure-Python (py3-none-any) wheels are supported.")
-            return
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = os.path.join(tmpdir, wheel_filename)
-            dl = _ralph_http.download(wheel_url, tmp_path, timeout=120)
-            if not dl.get("ok"):
-                errors.append(f"Failed to download {wheel_filename}")
-                return
-
+            return None, None, ("No compatible wheel found for '" + name + "'" +
+                                (f" version {ver}" if ver else "") +
+                                ". Only pure-Python (py3-none-any) wheels are supported.")
+
+        tmpdir = tempfile.mkdtemp()
+        tmp_path = os.path.join(tmpdir, wheel_filename)
+        dl = _ralph_http.download(wheel_url, tmp_path, timeout=120)
+        if not dl.get("ok"):
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            return None, None, f"Failed to download {wheel_filename}"
+
+        return tmpdir, tmp_path, None
+
+    # Level-synchronous BFS: each dependency level's index fetches and
+    # wheel downloads run concurrently (network latency dominates), while
+    # extraction and state updates stay on this thread - no locking needed
+    seen.add(_normalize(package))
+    frontier = [(package, version)]
+    depth = 0
+
+    while frontier:
+        if depth > _MAX_DEPTH:
+            for name, _ in frontier:
+                errors.append(f"Dependency depth limit exceeded for '{name}'")
+            break
+
+        todo = [(name, ver) for name, ver in frontier
+                if force or _normalize(name) not in index]
+        if not todo:
+            break
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda args: _fetch_one(*args), todo))
+
+        frontier = []
+        for (name, ver), (tmpdir, wheel_path, error) in zip(todo, results):
+            if error:
+                errors.append(error)
+                continue
+
+            # Read METADATA straight out of the wheel - no post-extract
+            # rescan of site-packages to discover what just landed
             try:
-                with zipfile.ZipFile(tmp_path, 'r') as zf:
+                with zipfile.ZipFile(wheel_path, 'r') as zf:
+                    meta_name = next(
+                        (n for n in zf.namelist()
+                         if n.endswith(".dist-info/METADATA")), None)
+                    meta_text = zf.read(meta_name).decode(
+                        "utf-8", errors="replace") if meta_name else ""
                     if not _safe_extractall(zf, site_packages, errors):
-                        return
+                        continue
             except zipfile.BadZipFile:
-                errors.append(f"Corrupted wheel file: {wheel_filename}")
-                return
-
-        installed_version = _get_installed_version(name, site_packages)
-        installed.append({"name": name, "version": installed_version or "unknown"})
-
-        deps = _get_dependencies(name, site_packages)
-        for dep_name, dep_ver in deps:
-            _install_one(dep_name, dep_ver, depth + 1)
-
-    _install_one(package, version)
+                errors.append(f"Corrupted wheel file: {os.path.basename(wheel_path)}")
+                continue
+            finally:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+
+            w_name, w_version, w_deps = _parse_metadata_lines(meta_text.splitlines())
+            if w_name:
+                index[_normalize(w_name)] = {
+                    "name": w_name, "version": w_version, "deps": w_deps,
+                    "path": os.path.join(site_packages,
+                                         meta_name.split("/", 1)[0]),
+                }
+            installed.append({"name": name, "version": w_version or "unknown"})
+
+            for dep_name, dep_ver in w_deps:
+                dep_norm = _normalize(dep_name)
+                if dep_norm not in seen:
+                    seen.add(dep_norm)
+                    frontier.append((dep_name, dep_ver))
+
+        depth += 1
 
     return {
         "success": len(errors) == 0,
@@ -130,50 +181,77 @@ def _do_list():
     if not os.path.isdir(site_packages):
         return {"packages": [], "count": 0}
 
-    packages = []
-    for entry in sorted(os.listdir(site_packages)):
-        if not entry.endswith(".dist-info"):
-            continue
-
-        meta_path = os.path.join(site_packages, entry, "METADATA")
-        name = None
-        version = None
-
-        if os.path.exists(meta_path):
-            with open(meta_path, 'r', encoding='utf-8', errors='replace') as f:
-                for line in f:
-                    if line.startswith("Name:"):
-                        name = line.split(":", 1)[1].strip()
-                    elif line.startswith("Version:"):
-                        version = line.split(":", 1)[1].strip()
-                    if name and version:
-                        break
-
-        if name:
-            packages.append({
-                "name": name,
-                "version": version or "unknown",
-                "location": site_packages
-            })
+    packages = [
+        {
+            "name": info["name"],
+            "version": info["version"] or "unknown",
+            "location": site_packages
+        }
+        for _, info in sorted(_build_index(site_packages).items())
+    ]
 
     return {"packages": packages, "count": len(packages)}
 
 
 def _normalize(name):
-    return re.sub(r'[-_.]+', '-', name).lower()
+    return _NORMALIZE_RE.sub('-', name).lower()
+
 
+def _parse_metadata_lines(lines):
+    """Extract Name, Version, and unconditional deps from METADATA lines.
 
-def _is_installed(name, site_packages):
-    norm = _normalize(name)
+    Returns (name, version, deps) where deps is a list of (name, version)
+    tuples; version is None when unpinned. Stops at the first blank line -
+    headers end there and the long description follows.
+    """
+    name = None
+    version = None
+    deps = []
+    for line in lines:
+        if line.startswith("Name:"):
+            name = line.split(":", 1)[1].strip()
+        elif line.startswith("Version:"):
+            version = line.split(":", 1)[1].strip()
+        elif line.startswith("Requires-Dist:"):
+            dep_spec = line.split(":", 1)[1].strip()
+            # Skip all conditional dependencies
+            if ";" in dep_spec:
+                continue
+            m = _DEP_NAME_RE.match(dep_spec)
+            if m:
+                ver_match = _DEP_VER_RE.search(dep_spec)
+                deps.append((m.group(1), ver_match.group(1) if ver_match else None))
+        elif line.strip() == '':
+            break
+    return name, version, deps
+
+
+def _parse_metadata(meta_path):
+    """Parse an on-disk dist-info METADATA file in one pass."""
+    try:
+        with open(meta_path, 'r', encoding='utf-8', errors='replace') as f:
+            return _parse_metadata_lines(f)
+    except FileNotFoundError:
+        return None, None, []
+
+
+def _build_index(site_packages):
+    """Scan site-packages once: normalized name -> {name, version, deps, path}."""
+    index = {}
     if not os.path.isdir(site_packages):
-        return False
-    for entry in os.listdir(site_packages):
-        if entry.endswith(".dist-info"):
-            dist_name = _name_from_dist_info(
-                os.path.join(site_packages, entry))
-            if dist_name and _normalize(dist_name) == norm:
-                return True
-    return False
+        return index
+    with os.scandir(site_packages) as it:
+        for entry in it:
+            if not entry.name.endswith(".dist-info"):
+                continue
+            name, version, deps = _parse_metadata(
+                os.path.join(entry.path, "METADATA"))
+            if name:
+                index[_normalize(name)] = {
+                    "name": name, "version": version,
+                    "deps": deps, "path": entry.path,
+                }
+    return index
 
 
 def _safe_extractall(zf, dest, errors):
@@ -189,71 +267,82 @@ def _safe_extractall(zf, dest, errors):
 
 
 def _find_best_wheel(html, package_name, target_version):
-    """Parse PyPI simple HTML to find the best py3-none-any wheel."""
-    href_pattern = re.compile(r'<a\s+href="([^"]+)"[^>]*>([^<]+)</a>', re.IGNORECASE)
-    matches = href_pattern.findall(html)
+    """Parse PyPI simple HTML to find the best py3-none-any wheel.
+
+    Streams anchors through html.parser instead of regex-materializing
+    every match; only compatible wheels are kept as candidates.
+    """
+    from html.parser import HTMLParser
 
     candidates = []
-    for url, filename in matches:
-        if not filename.endswith(".whl"):
-            continue
 
-        # Wheel format: {name}-{version}-{python}-{abi}-{platform}.whl
-        # Split from right since name/version can contain hyphens
-        parts = filename[:-4].rsplit("-", 3)
-        if len(parts) != 4:
-            continue
+    class _WheelAnchors(HTMLParser):
+        def handle_starttag(self, tag, attrs):
+            if tag != "a":
+                return
+            href = next((v for k, v in attrs if k == "href"), None)
+            if not href:
+                return
+
+            # Strip fragment (hash) from URL; filename is the basename
+            clean_url = href.split("#", 1)[0]
+            filename = clean_url.rsplit("/", 1)[-1]
+            if not filename.endswith(".whl"):
+                return
+
+            # Wheel format: {name}-{version}-{python}-{abi}-{platform}.whl
+            # Split from right since name/version can contain hyphens
+            parts = filename[:-4].rsplit("-", 3)
+            if len(parts) != 4:
+                return
 
-        name_version = parts[0]
-        py_tag = parts[1]
-        abi_tag = parts[2]
-        plat_tag = parts[3]
+            name_version, py_tag, abi_tag, plat_tag = parts
 
-        if abi_tag != "none" or plat_tag != "any":
-            continue
-        if not (py_tag.startswith("py3") or py_tag.startswith("py2.py3")):
-            continue
+            if abi_tag != "none" or plat_tag != "any":
+                return
+            if not (py_tag.startswith("py3") or py_tag.startswith("py2.py3")):
+                return
 
-        # name_version is "{name}-{version}" -- split at last hyphen for version
-        nv_parts = name_version.rsplit("-", 1)
-        if len(nv_parts) != 2:
-            continue
-        whl_version = nv_parts[1]
+            # name_version is "{name}-{version}" -- split at last hyphen for version
+            nv_parts = name_version.rsplit("-", 1)
+            if len(nv_parts) != 2:
+                return
+            whl_version = nv_parts[1]
 
-        if target_version and whl_version != target_version:
-            continue
+            if target_version and whl_version != target_version:
+                return
 
-        # Strip fragment (hash) from URL
-        clean_url = url.split("#")[0]
+            candidates.append((whl_version, clean_url, filename))
 
-        candidates.append((whl_version, clean_url, filename))
+    _WheelAnchors().feed(html)
 
     if not candidates:
         return None, None
 
-    candidates.sort(key=lambda c: _version_key(c[0]), reverse=True)
-    best = candidates[0]
+    best = max(candidates, key=lambda c: _version_key(c[0]))
     return best[1], best[2]
 
 
+@functools.lru_cache(maxsize=4096)
 def _version_key(version_str):
     """Convert version string to a sortable tuple.
 
     Pre-release suffixes (a, b, rc, dev) sort before the corresponding
-    release so that stable versions are preferred.
+    release so that stable versions are preferred. Cached - the same
+    version strings recur across an index's candidate wheels.
     """
     _PRE_RELEASE = {"dev": -4, "a": -3, "alpha": -3, "b": -2, "beta": -2, "rc": -1}
 
     parts = []
     for segment in version_str.split("."):
         # Split numeric prefix from alpha suffix: "0rc1" -> "0", "rc1"
-        m = re.match(r'^(\d+)(.*)', segment)
+        m = _SEG_RE.match(segment)
         if m:
             parts.append((0, int(m.group(1))))
             rest = m.group(2)
             if rest:
                 # Extract pre-release tag: "rc1" -> "rc", "1"
-                tag_match = re.match(r'^(dev|alpha|beta|a|b|rc)(\d*)', rest, re.I)
+                tag_match = _TAG_RE.match(rest)
                 if tag_match:
                     tag = tag_match.group(1).lower()
                     tag_num = int(tag_match.group(2)) if tag_match.group(2) else 0
@@ -268,60 +357,3 @@ def _version_key(version_str):
     return tuple(parts)
 
 
-def _name_from_dist_info(dist_info_dir):
-    """Read the package name from a dist-info METADATA file."""
-    meta_path = os.path.join(dist_info_dir, "METADATA")
-    if not os.path.exists(meta_path):
-        return None
-    with open(meta_path, 'r', encoding='utf-8', errors='replace') as f:
-        for line in f:
-            if line.startswith("Name:"):
-                return line.split(":", 1)[1].strip()
-            if line.strip() == '':
-                break
-    return None
-
-
-def _get_installed_version(name, site_packages):
-    """Get the installed version from dist-info METADATA."""
-    norm = re.sub(r'[-_.]+', '-', name).lower()
-    for entry in os.listdir(site_packages):
-        if entry.endswith(".dist-info"):
-            dist_name = _name_from_dist_info(
-                os.path.join(site_packages, entry))
-            if dist_name and re.sub(r'[-_.]+', '-', dist_name).lower() == norm:
-                meta_path = os.path.join(site_packages, entry, "METADATA")
-                with open(meta_path, 'r', encoding='utf-8', errors='replace') as f:
-                    for line in f:
-                        if line.startswith("Version:"):
-                            return line.split(":", 1)[1].strip()
-    return None
-
-
-def _get_dependencies(name, site_packages):
-    """Parse unconditional Requires-Dist from installed package METADATA."""
-    norm = re.sub(r'[-_.]+', '-', name).lower()
-    deps = []
-    for entry in os.listdir(site_packages):
-        if entry.endswith(".dist-info"):
-            dist_name = _name_from_dist_info(
-                os.path.join(site_packages, entry))
-            if dist_name and re.sub(r'[-_.]+', '-', dist_name).lower() == norm:
-                meta_path = os.path.join(site_packages, entry, "METADATA")
-                with open(meta_path, 'r', encoding='utf-8', errors='replace') as f:
-                    for line in f:
-                        if line.startswith("Requires-Dist:"):
-                            dep = line.split(":", 1)[1].strip()
-                            # Skip all conditional dependencies
-                            if ";" in dep:
-                                continue
-                            dep_spec = dep.strip()
-                            m = re.match(r'^([A-Za-z0-9][-A-Za-z0-9_.]*)', dep_spec)
-                            if m:
-                                dep_name = m.group(1)
-                                dep_ver = None
-                                ver_match = re.search(r'==\s*([^\s,;\]]+)', dep_spec)
-                                if ver_match:
-                                    dep_ver = ver_match.group(1)
-                                deps.append((dep_name, dep_ver))
-    return deps
@@ -4,9 +4,34 @@ Gate: file_read
 Match: path
 """
 
-
+import functools
+import mmap
+import os
+import stat
+from pathlib import Path
+
+# Probed once at load time with the verified-IO entry points bound to
+# module globals - the per-call happy path is one None check plus direct
+# calls, no attribute lookups
+try:
+    import _ralph_verified_io
+    _vio_has_ctx = _ralph_verified_io.has_verified_context
+    _vio_get_path = _ralph_verified_io.get_resolved_path
+    _vio_match = _ralph_verified_io.path_matches
+    _vio_open = _ralph_verified_io.open_verified
+except ImportError:
+    _vio_has_ctx = None
+
+
+@functools.lru_cache(maxsize=1024)
 def _is_traversal_path(path: str) -> bool:
-    """Check if path contains directory traversal attempts."""
+    """Check if path contains directory traversal attempts.
+
+    Cached - agent loops hit the same handful of paths over and over
+    (read, patch, re-read), so repeat checks are a dict hit.
+    """
+    if '..' not in path:
+        return False
     parts = path.replace('\\', '/').split('/')
     return '..' in parts
 
@@ -22,22 +47,76 @@ def read_file(path: str, start_line: int = 1, end_line: int = None) -> dict:
     Returns:
         Dictionary with content (line-numbered text), total_lines, and range
     """
-    from pathlib import Path
-    import os
-
     # Security check - prevent directory traversal
     if _is_traversal_path(path):
         raise ValueError("Invalid path: directory traversal not allowed")
 
+    start = max(0, start_line - 1)  # Convert to 0-based
+
+    def read_range_buffer(buf):
+        """Extract the requested line range from a bytes-like buffer.
+
+        Newline bytes never occur inside multi-byte UTF-8 sequences, so
+        byte offsets found with find(b'\\n') are valid decode boundaries.
+        Only the selected slice becomes Python strings; line counting is
+        memchr-speed scans over the raw bytes.
+        """
+        n = len(buf)
+        # Skip to the byte offset of the first requested line
+        pos = 0
+        for _ in range(start):
+            idx = buf.find(b'\n', pos)
+            if idx == -1:
+                pos = n
+                break
+            pos = idx + 1
+        begin = pos
+        # Advance past the requested number of lines
+        for _ in range(max(0, end_line - start)):
+            idx = buf.find(b'\n', pos)
+            if idx == -1:
+                pos = n
+                break
+            pos = idx + 1
+        picked = buf[begin:pos].decode('utf-8', 'replace').splitlines()
+        # Exact total without materializing any other lines
+        total = 0
+        idx = buf.find(b'\n', 0)
+        while idx != -1:
+            total += 1
+            idx = buf.find(b'\n', idx + 1)
+        if n and buf[n - 1:n] != b'\n':
+            total += 1
+        return picked, total
+
+    def read_range_mapped(bf):
+        """Range-read an open binary file, mmap-backed where possible.
+
+        The mapping serves bytes straight from the page cache with no
+        intermediate whole-file copy; decode cost is proportional to the
+        requested slice, not the file size. mmap refuses empty files and
+        some filesystems - fall back to a plain read there.
+        """
+        try:
+            mm = mmap.mmap(bf.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return read_range_buffer(bf.read())
+        with mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                # The find() scans walk the mapping front to back -
+                # tell the kernel to read ahead accordingly
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return read_range_buffer(mm)
+
     # Try to use verified file I/O for TOCTOU-safe reads
     # This is available when approval gates have verified the path
     content = None
+    selected = None
     try:
-        import _ralph_verified_io
-        if _ralph_verified_io.has_verified_context():
+        if _vio_has_ctx is not None and _vio_has_ctx():
             # Use the resolved path from the verified context (not re-resolving)
-            verified_path = _ralph_verified_io.get_resolved_path()
-            if verified_path and _ralph_verified_io.path_matches(path):
+            verified_path = _vio_get_path()
+            if verified_path and _vio_match(path):
                 p = Path(verified_path)
                 if not p.exists():
                     raise FileNotFoundError(f"File not found: {path}")
@@ -48,51 +127,80 @@ def read_file(path: str, start_line: int = 1, end_line: int = None) -> dict:
                 if p.stat().st_size > max_size:
                     raise ValueError(f"File too large (>{max_size} bytes): {path}")
                 # Use the verified file context for atomic open
-                fd = _ralph_verified_io.open_verified(str(p), 'r')
-                with os.fdopen(fd, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
-    except ImportError:
-        # Module not available - fall through to standard I/O
-        pass
+                fd = _vio_open(str(p), 'r')
+                if end_line is not None:
+                    with os.fdopen(fd, 'rb') as bf:
+                        selected, total_lines = read_range_mapped(bf)
+                else:
+                    with os.fdopen(fd, 'r', encoding='utf-8',
+                                   errors='replace') as f:
+                        content = f.read()
     except OSError as e:
         # Verification failed - report the error
         raise OSError(f"File verification failed: {e}")
 
     # Standard path resolution when verified context not available
-    if content is None:
-        p = Path(path).resolve()
-
-        if not p.exists():
+    if content is None and selected is None:
+        # Already-canonical absolute paths skip abspath's normalization
+        # pass; one os.stat then answers exists + is-file + size in a
+        # single syscall instead of Path.resolve's per-segment lstat walk
+        if os.path.isabs(path) and '..' not in path and '/./' not in path:
+            p_str = path
+        else:
+            p_str = os.path.abspath(path)
+
+        try:
+            st = os.stat(p_str)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {path}")
 
-        if not p.is_file():
+        if not stat.S_ISREG(st.st_mode):
             raise ValueError(f"Not a file: {path}")
 
         # Check file size (1MB limit)
         max_size = 1024 * 1024
-        if p.stat().st_size > max_size:
+        size = st.st_size
+        if size > max_size:
             raise ValueError(f"File too large (>{max_size} bytes): {path}")
 
-    # Fall back to standard file I/O (when gates disabled or no context)
-    if content is None:
-        content = p.read_text(encoding='utf-8', errors='replace')
-
-    all_lines = content.splitlines(keepends=True)
-    total_lines = len(all_lines)
-
-    # Apply line range if specified
-    start = max(0, start_line - 1)  # Convert to 0-based
-    end = end_line if end_line is not None else total_lines
-    end = min(end, total_lines)
-    selected = all_lines[start:end]
+        # Fall back to standard file I/O (when gates disabled or no context)
+        if end_line is not None:
+            with open(p_str, 'rb') as bf:
+                selected, total_lines = read_range_mapped(bf)
+        elif size > 64 * 1024:
+            # Decode straight out of the page cache - mmap skips read()'s
+            # intermediate whole-file bytes copy
+            with open(p_str, 'rb') as bf:
+                try:
+                    mm = mmap.mmap(bf.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    content = bf.read().decode('utf-8', errors='replace')
+                else:
+                    with mm:
+                        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        content = str(mm, 'utf-8', 'replace')
+        else:
+            with open(p_str, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+
+    if selected is None:
+        # Whole-file read: split once and keep everything. No keepends -
+        # the numbered output below wants bare lines, so splitting them
+        # off here saves an rstrip allocation per line
+        all_lines = content.splitlines()
+        total_lines = len(all_lines)
+        end = total_lines
+        selected = all_lines[start:]
+    else:
+        end = min(end_line, total_lines)
 
     # Build line-numbered content
-    numbered = []
-    for i, line in enumerate(selected, start=start + 1):
-        # Strip trailing newline for consistent formatting, then re-add
-        numbered.append(f"{i}: {line.rstrip(chr(10)).rstrip(chr(13))}")
-    numbered_content = '\n'.join(numbered)
-    if numbered:
+    numbered_content = '\n'.join(
+        f"{i}: {line}"
+        for i, line in enumerate(selected, start=start + 1)
+    )
+    if selected:
         numbered_content += '\n'
 
     range_str = f"{start + 1}-{end}" if total_lines > 0 else "0-0"
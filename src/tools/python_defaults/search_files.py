@@ -4,14 +4,88 @@ Gate: file_read
 Match: pattern
 """
 
+import bisect
+import concurrent.futures
+import fnmatch
+import functools
+import os
+import re
+import stat as stat_mod
+from array import array
+from pathlib import Path
+
+
 MAX_FILE_SIZE = 1024 * 1024  # 1MB
 CONTEXT_CHARS = 30  # Characters of context around match
 MAX_LINE_DISPLAY = 500  # Max characters to display per line
 MAX_CONTEXT_LINES = 10  # Maximum surrounding context lines
 
+# Directories to skip
+_SKIP_DIRS = frozenset({'.git', '.svn', '.hg', 'node_modules', '__pycache__',
+                        '.cache', 'build', 'dist', 'deps', 'vendor',
+                        '.venv', 'venv'})
+
+# Binary extensions to skip (lowercase)
+_BINARY_EXTS = frozenset({'.exe', '.dll', '.so', '.dylib', '.a', '.o', '.obj',
+                          '.zip', '.tar', '.gz', '.bz2', '.xz', '.7z', '.rar',
+                          '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico',
+                          '.svg', '.mp3', '.mp4', '.avi', '.mov', '.mkv',
+                          '.wav', '.pdf', '.doc', '.docx', '.xls', '.xlsx',
+                          '.pyc', '.pyo', '.class', '.wasm', '.db',
+                          '.sqlite'})
+
+
+def _crlf_tolerant(pattern: str) -> str:
+    """Rewrite bare '$' anchors to '(?=\\r?$)' so they match CRLF lines.
+
+    Whole-buffer matching sees raw line endings, where a MULTILINE '$'
+    only matches before '\\n' and a preceding '\\r' blocks it; per-line
+    matching over splitlines() output never saw the '\\r'. Escaped '\\$'
+    and '$' inside character classes are left untouched.
+    """
+    out = []
+    i = 0
+    n = len(pattern)
+    in_class = False
+    while i < n:
+        c = pattern[i]
+        if c == '\\':
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            if c == ']':
+                in_class = False
+            out.append(c)
+        elif c == '[':
+            in_class = True
+            out.append(c)
+            # A ']' first in the class (after optional '^') is a literal
+            j = i + 1
+            if j < n and pattern[j] == '^':
+                out.append('^')
+                i = j
+                j += 1
+            if j < n and pattern[j] == ']':
+                out.append(']')
+                i = j
+        elif c == '$':
+            out.append(r'(?=\r?$)')
+        else:
+            out.append(c)
+        i += 1
+    return ''.join(out)
+
 
+@functools.lru_cache(maxsize=1024)
 def _is_traversal_path(path: str) -> bool:
-    """Check if path contains directory traversal attempts."""
+    """Check if path contains directory traversal attempts.
+
+    Cached - agent loops hit the same handful of paths over and over
+    (read, patch, re-read), so repeat checks are a dict hit.
+    """
+    if '..' not in path:
+        return False
     parts = path.replace('\\', '/').split('/')
     return '..' in parts
 
@@ -34,26 +108,55 @@ def search_files(path: str, pattern: str, glob_filter: str = None,
         Dictionary with results list, total_matches, total_matches_found,
         matched_files, files_searched, and truncated flag
     """
-    from pathlib import Path
-    import re
-    import os
-
     # Security check - prevent directory traversal
     if _is_traversal_path(path):
         raise ValueError("Invalid path: directory traversal not allowed")
 
-    p = Path(path).resolve()
-
-    if not p.exists():
+    # Already-canonical absolute paths skip abspath's normalization pass;
+    # one os.stat then answers exists + is-file + size in a single
+    # syscall instead of Path.resolve's per-segment lstat walk
+    if os.path.isabs(path) and '..' not in path and '/./' not in path:
+        p_str = path
+    else:
+        p_str = os.path.abspath(path)
+    try:
+        root_st = os.stat(p_str)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Path not found: {path}")
 
-    # Compile regex pattern
-    flags = 0 if case_sensitive else re.IGNORECASE
+    # Compile regex pattern. MULTILINE keeps ^/$ anchored to line
+    # boundaries now that matching runs over the whole buffer at once
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
     try:
         regex = re.compile(pattern, flags)
     except re.error as e:
         raise ValueError(f"Invalid regex pattern '{pattern}': {e}")
 
+    # '$'-anchored patterns must still hit CRLF-ended lines now that the
+    # raw buffer (with its '\r's) is what gets matched
+    if '$' in pattern:
+        crlf_pattern = _crlf_tolerant(pattern)
+        try:
+            regex = re.compile(crlf_pattern, flags)
+        except re.error:
+            crlf_pattern = pattern  # Rewrite misfired; keep the original
+    else:
+        crlf_pattern = pattern
+
+    # ASCII patterns also compile as a bytes regex, letting files be
+    # scanned without decoding them - only matched lines ever pay the
+    # UTF-8 decode. Class escapes (\w, \b, \s, \d and their negations)
+    # are ASCII-only in bytes patterns, so anything using them keeps the
+    # str engine and its Unicode meaning; the check is conservative (an
+    # escaped backslash before one of the letters also opts out, which
+    # merely skips the fast path). Non-ASCII patterns fall back too
+    bytes_regex = None
+    if re.search(r'\\[wWbBsSdD]', pattern) is None:
+        try:
+            bytes_regex = re.compile(crlf_pattern.encode('ascii'), flags)
+        except (UnicodeEncodeError, re.error):
+            pass
+
     # Clamp context_lines
     context_lines = max(0, min(int(context_lines), MAX_CONTEXT_LINES))
 
@@ -62,50 +165,138 @@ def search_files(path: str, pattern: str, glob_filter: str = None,
     total_matches_found = 0
     matched_files_set = set()
 
-    # Directories to skip
-    skip_dirs = {'.git', '.svn', '.hg', 'node_modules', '__pycache__',
-                 '.cache', 'build', 'dist', 'deps', 'vendor', '.venv', 'venv'}
-
-    # Binary extensions to skip
-    binary_exts = {'.exe', '.dll', '.so', '.dylib', '.a', '.o', '.obj',
-                   '.zip', '.tar', '.gz', '.bz2', '.xz', '.7z', '.rar',
-                   '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.svg',
-                   '.mp3', '.mp4', '.avi', '.mov', '.mkv', '.wav',
-                   '.pdf', '.doc', '.docx', '.xls', '.xlsx',
-                   '.pyc', '.pyo', '.class', '.wasm', '.db', '.sqlite'}
-
-    def should_skip_file(file_path):
-        return file_path.suffix.lower() in binary_exts
-
-    def search_in_file(file_path):
-        nonlocal files_searched, total_matches_found
-
+    _fadvise = getattr(os, 'posix_fadvise', None)
+
+    def should_skip_name(name):
+        # rpartition beats Path.suffix - no Path object, no property
+        # call; islower skips the lowercase allocation for the common
+        # all-lowercase suffix
+        suffix = name.rpartition('.')[2]
+        if not suffix.islower():
+            suffix = suffix.lower()
+        return '.' + suffix in _BINARY_EXTS
+
+    # Globs compile once per call via fnmatch.translate instead of
+    # Path.match re-parsing the pattern for every file. Name-only
+    # patterns are one regex over entry.name; path-shaped patterns
+    # become per-component regexes matched right-anchored against the
+    # candidate's trailing components, which is Path.match's semantics
+    if glob_filter and '/' not in glob_filter:
+        glob_match = re.compile(fnmatch.translate(glob_filter)).match
+
+        def matches_glob(name, path_str):
+            return glob_match(name) is not None
+    elif glob_filter and not glob_filter.startswith('/'):
+        component_matchers = [re.compile(fnmatch.translate(c)).match
+                              for c in glob_filter.split('/') if c]
+        n_components = len(component_matchers)
+
+        def matches_glob(name, path_str):
+            parts = path_str.replace(os.sep, '/').split('/')
+            if len(parts) < n_components:
+                return False
+            return all(m(c) for m, c in
+                       zip(component_matchers, parts[-n_components:]))
+    elif glob_filter:
+        # Absolute patterns: keep pathlib's anchored matching
+        def matches_glob(name, path_str):
+            return Path(path_str).match(glob_filter)
+    else:
+        matches_glob = None
+
+    def scan_file(candidate):
+        """Scan one (path_str, size) candidate and return
+        (entries, match_count, searched, file_str).
+
+        Touches no shared state, so instances run safely on pool threads;
+        the caller merges results in submission order, which keeps output
+        deterministic without any locking.
+        """
+        path_str, size = candidate
+        entries = []
+        match_count = 0
+        file_str = None
         try:
-            stat = file_path.stat()
-            if stat.st_size > MAX_FILE_SIZE:
-                return
-
-            content = file_path.read_text(encoding='utf-8', errors='replace')
-            files_searched += 1
-            all_lines = content.splitlines()
-
-            for line_idx, line in enumerate(all_lines):
-                matches = list(regex.finditer(line))
-                if not matches:
-                    continue
-
-                line_num = line_idx + 1
-                total_matches_found += len(matches)
-                file_str = str(file_path)
-                matched_files_set.add(file_str)
-
-                if len(results) >= max_results:
-                    return  # Stop scanning this file once results are full
-
-                # Build match context from first match on this line
-                match = matches[0]
-                start = max(0, match.start() - CONTEXT_CHARS)
-                end = min(len(line), match.end() + CONTEXT_CHARS)
+            if size > MAX_FILE_SIZE:
+                return entries, 0, False, None
+
+            with open(path_str, 'rb') as bf:
+                if _fadvise is not None:
+                    # SEQUENTIAL widens the kernel readahead window;
+                    # WILLNEED starts it before the first read blocks
+                    _fadvise(bf.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    _fadvise(bf.fileno(), 0, size, os.POSIX_FADV_WILLNEED)
+                data = bf.read()
+
+            # Content sniff: a NUL in the first 4KB marks a binary file
+            # regardless of extension - skip before any decode
+            if b'\x00' in data[:4096]:
+                return entries, 0, False, None
+
+            # Scan raw bytes when the pattern allows it; the whole-file
+            # UTF-8 decode disappears and only matched lines are decoded.
+            # Otherwise decode once and match the str as before
+            if bytes_regex is not None:
+                content = data
+                nl = b'\n'
+                engine = bytes_regex
+            else:
+                content = data.decode('utf-8', errors='replace')
+                nl = '\n'
+                engine = regex
+
+            def decode(piece):
+                return (piece.decode('utf-8', errors='replace')
+                        if engine is bytes_regex else piece)
+
+            # One regex-engine pass over the contiguous buffer instead of
+            # a Python-level finditer call per line. Line numbers come
+            # from bisecting a C-int array of newline offsets - O(log n)
+            # per hit, no per-line string allocations
+            nl_offsets = array('i')
+            off = content.find(nl)
+            while off != -1:
+                nl_offsets.append(off)
+                off = content.find(nl, off + 1)
+            num_lines = len(nl_offsets)
+            if content and not content.endswith(nl):
+                num_lines += 1
+
+            def line_bounds(idx):
+                line_start = nl_offsets[idx - 1] + 1 if idx else 0
+                line_end = (nl_offsets[idx] if idx < len(nl_offsets)
+                            else len(content))
+                return line_start, line_end
+
+            last_line_idx = -1
+            for match in engine.finditer(content):
+                match_count += 1
+                if file_str is None:
+                    file_str = path_str
+
+                line_idx = bisect.bisect_left(nl_offsets, match.start())
+                if line_idx == last_line_idx:
+                    continue  # One result entry per line; counters still advance
+                last_line_idx = line_idx
+
+                if len(entries) >= max_results:
+                    continue  # Entries are full; keep counting matches
+
+                line_start, line_end = line_bounds(line_idx)
+                line = decode(content[line_start:line_end])
+
+                # Build match context from first match on this line. On
+                # the bytes path the raw offsets are byte positions, so
+                # re-locate the match in the decoded line for display
+                if engine is bytes_regex:
+                    line_match = regex.search(line)
+                    col_start, col_end = (line_match.span() if line_match
+                                          else (0, 0))
+                else:
+                    col_start = match.start() - line_start
+                    col_end = min(match.end(), line_end) - line_start
+                start = max(0, col_start - CONTEXT_CHARS)
+                end = min(len(line), col_end + CONTEXT_CHARS)
                 context = line[start:end]
                 if start > 0:
                     context = '...' + context
@@ -114,7 +305,7 @@ def search_files(path: str, pattern: str, glob_filter: str = None,
 
                 result_entry = {
                     "file_path": file_str,
-                    "line_number": line_num,
+                    "line_number": line_idx + 1,
                     "line_content": line.strip()[:MAX_LINE_DISPLAY],
                     "match_context": context
                 }
@@ -122,60 +313,107 @@ def search_files(path: str, pattern: str, glob_filter: str = None,
                 if context_lines > 0:
                     surrounding = []
                     ctx_start = max(0, line_idx - context_lines)
-                    ctx_end = min(len(all_lines), line_idx + context_lines + 1)
+                    ctx_end = min(num_lines, line_idx + context_lines + 1)
                     for ci in range(ctx_start, ctx_end):
                         if ci == line_idx:
                             continue
+                        cs, ce = line_bounds(ci)
                         surrounding.append({
                             "line_number": ci + 1,
-                            "content": all_lines[ci][:MAX_LINE_DISPLAY]
+                            "content": decode(content[cs:ce])[:MAX_LINE_DISPLAY]
                         })
                     result_entry["surrounding_lines"] = surrounding
 
-                results.append(result_entry)
+                entries.append(result_entry)
         except (PermissionError, OSError, UnicodeDecodeError):
-            pass  # Skip files we can't read
-
-    if p.is_file():
-        if not should_skip_file(p):
-            search_in_file(p)
-    else:
-        if recursive:
-            for root, dirs, files in os.walk(p):
-                # Filter out directories to skip
-                dirs[:] = [d for d in dirs if d not in skip_dirs]
-
-                for name in files:
-                    if len(results) >= max_results:
-                        break
-
-                    file_path = Path(root) / name
-
-                    if should_skip_file(file_path):
-                        continue
-
-                    if glob_filter and not file_path.match(glob_filter):
-                        continue
-
-                    search_in_file(file_path)
-
-                if len(results) >= max_results:
-                    break
-        else:
-            for file_path in p.iterdir():
-                if len(results) >= max_results:
-                    break
-
-                if not file_path.is_file():
+            return [], 0, False, None  # Skip files we can't read
+
+        if _fadvise is not None and match_count == 0:
+            # Unmatched files won't be re-read by the agent; drop their
+            # pages so a tree-wide grep doesn't evict hot interactive data
+            try:
+                dfd = os.open(path_str, os.O_RDONLY)
+                try:
+                    _fadvise(dfd, 0, 0, os.POSIX_FADV_DONTNEED)
+                finally:
+                    os.close(dfd)
+            except OSError:
+                pass
+
+        return entries, match_count, True, file_str
+
+    # Collect candidate files first - the walk itself is cheap getdents
+    # work; the expensive reads then overlap on a thread pool. DirEntry
+    # type and stat come from the scandir cache, so each candidate costs
+    # at most one stat and no Path construction
+    candidates = []
+
+    def collect_from(it):
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.name not in _SKIP_DIRS:
+                        stack.append(entry.path)
                     continue
-
-                if should_skip_file(file_path):
+                if not entry.is_file(follow_symlinks=False):
                     continue
-
-                if glob_filter and not file_path.match(glob_filter):
+                if should_skip_name(entry.name):
+                    continue
+                if matches_glob and not matches_glob(entry.name, entry.path):
                     continue
+                candidates.append((entry.path, entry.stat().st_size))
+            except OSError:
+                continue
 
-                search_in_file(file_path)
+    if stat_mod.S_ISREG(root_st.st_mode):
+        if not should_skip_name(os.path.basename(p_str)):
+            candidates.append((p_str, root_st.st_size))
+    else:
+        stack = [p_str]
+        while stack:
+            current = stack.pop()
+            try:
+                it = os.scandir(current)
+            except (PermissionError, OSError):
+                continue
+            with it:
+                collect_from(it)
+
+    # Scan cheap files first: small files complete (and surface their
+    # hits) while the few large ones are still reading, so interactive
+    # searches fill max_results sooner. The sort is stable, keeping
+    # walk order among equal sizes and output deterministic
+    candidates.sort(key=lambda c: c[1])
+
+    def merge(scan_result):
+        nonlocal files_searched, total_matches_found
+        entries, match_count, searched, file_str = scan_result
+        files_searched += searched
+        total_matches_found += match_count
+        if file_str:
+            matched_files_set.add(file_str)
+        for entry in entries:
+            if len(results) >= max_results:
+                break
+            results.append(entry)
+
+    if len(candidates) <= 1:
+        for file_path in candidates:
+            merge(scan_file(file_path))
+    else:
+        # Blocking reads on one file overlap kernel readahead on the
+        # next; merging on this thread in submission order keeps results
+        # deterministic. Remaining tasks are cancelled once results fill
+        max_workers = min(32, (os.cpu_count() or 4) * 4)
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers)
+        try:
+            for scan_result in executor.map(scan_file, candidates):
+                merge(scan_result)
+                if len(results) >= max_results:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     return {
         "results": results,
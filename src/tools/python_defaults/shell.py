@@ -10,9 +10,63 @@ list provides defense-in-depth against obvious accidents, not a security
 boundary. This is by design for an agent development tool.
 """
 
+import functools
+import os
+import re
+import stat
+import subprocess
+import threading
+import time
+
+# Dangerous command patterns (defense-in-depth, not a security boundary -
+# see module docstring). Compiled into one alternation so every pattern
+# is checked in a single case-insensitive scan of the command, with no
+# per-call lowercase copy
+_DANGEROUS_PATTERNS = (
+    'rm -rf /',
+    'rm -rf /*',
+    'mkfs',
+    'dd if=',
+    ':(){ :|:& };:',
+    'chmod -R 777 /',
+)
+_DANGER_RE = re.compile('|'.join(re.escape(p) for p in _DANGEROUS_PATTERNS),
+                        re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=128)
+def _validate_working_dir(working_dir: str, _ttl_bucket: int):
+    """Resolve and check a working directory with a single stat.
+
+    Agents run many commands from the same directory, so results are
+    cached; _ttl_bucket is int(monotonic()), rolling the key every
+    second so a deleted directory is noticed promptly.
+
+    Returns (resolved_path, None) on success, (None, error) otherwise.
+    """
+    if (os.path.isabs(working_dir) and '..' not in working_dir
+            and '/./' not in working_dir):
+        wd = working_dir
+    else:
+        wd = os.path.abspath(working_dir)
+    try:
+        st = os.stat(wd)
+    except OSError:
+        return None, f"Error: Working directory not found: {working_dir}"
+    if not stat.S_ISDIR(st.st_mode):
+        return None, f"Error: Not a directory: {working_dir}"
+    return wd, None
+
 
+@functools.lru_cache(maxsize=1024)
 def _is_traversal_path(path: str) -> bool:
-    """Check if path contains directory traversal attempts."""
+    """Check if path contains directory traversal attempts.
+
+    Cached - agent loops hit the same handful of paths over and over
+    (read, patch, re-read), so repeat checks are a dict hit.
+    """
+    if '..' not in path:
+        return False
     parts = path.replace('\\', '/').split('/')
     return '..' in parts
 
@@ -30,10 +84,6 @@ def shell(command: str, working_dir: str = None, timeout: int = 30,
     Returns:
         Dictionary with stdout, stderr, exit_code, and execution_time
     """
-    import subprocess
-    import time
-    from pathlib import Path
-
     # Validate timeout
     if timeout <= 0:
         timeout = 30
@@ -41,25 +91,14 @@ def shell(command: str, working_dir: str = None, timeout: int = 30,
         timeout = 300
 
     # Security checks - reject dangerous patterns
-    dangerous_patterns = [
-        'rm -rf /',
-        'rm -rf /*',
-        'mkfs',
-        'dd if=',
-        ':(){ :|:& };:',
-        'chmod -R 777 /',
-    ]
-
-    cmd_lower = command.lower()
-    for pattern in dangerous_patterns:
-        if pattern.lower() in cmd_lower:
-            return {
-                "stdout": "",
-                "stderr": "Error: Command failed security validation",
-                "exit_code": -1,
-                "execution_time": 0.0,
-                "timed_out": False
-            }
+    if _DANGER_RE.search(command):
+        return {
+            "stdout": "",
+            "stderr": "Error: Command failed security validation",
+            "exit_code": -1,
+            "execution_time": 0.0,
+            "timed_out": False
+        }
 
     # Validate working directory if specified
     if working_dir:
@@ -73,24 +112,17 @@ def shell(command: str, working_dir: str = None, timeout: int = 30,
                 "timed_out": False
             }
 
-        wd = Path(working_dir).resolve()
-        if not wd.exists():
+        wd, error = _validate_working_dir(working_dir,
+                                          int(time.monotonic()))
+        if error:
             return {
                 "stdout": "",
-                "stderr": f"Error: Working directory not found: {working_dir}",
+                "stderr": error,
                 "exit_code": -1,
                 "execution_time": 0.0,
                 "timed_out": False
             }
-        if not wd.is_dir():
-            return {
-                "stdout": "",
-                "stderr": f"Error: Not a directory: {working_dir}",
-                "exit_code": -1,
-                "execution_time": 0.0,
-                "timed_out": False
-            }
-        working_dir = str(wd)
+        working_dir = wd
 
     start = time.time()
     timed_out = False
@@ -98,30 +130,62 @@ def shell(command: str, working_dir: str = None, timeout: int = 30,
     # Build a clean environment for child processes.
     # Scaffold's embedded Python sets PYTHONHOME=/zip which breaks any
     # system Python invoked by the agent (e.g. `python -m pytest`).
-    import os as _os
-    clean_env = {k: v for k, v in _os.environ.items()
+    clean_env = {k: v for k, v in os.environ.items()
                  if k not in ("PYTHONHOME", "PYTHONDONTWRITEBYTECODE")}
 
+    # Stream child output into capped buffers instead of letting
+    # capture_output buffer everything: a runaway child costs at most
+    # max_output+1 bytes of memory, gets killed once it blows the cap,
+    # and the output is decoded exactly once at the end
+    max_output = 1024 * 1024  # 1MB
+    cap = max_output + 1  # One byte past the limit marks truncation
+
+    out_buf = bytearray()
+    err_buf = bytearray()
+
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             command,
             shell=True,
             cwd=working_dir,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if capture_stderr
+            else subprocess.DEVNULL,
             env=clean_env,
         )
 
-        stdout = result.stdout
-        stderr = result.stderr if capture_stderr else ""
-        exit_code = result.returncode
-
-    except subprocess.TimeoutExpired as e:
-        timed_out = True
-        stdout = e.stdout if e.stdout else ""
-        stderr = e.stderr if e.stderr and capture_stderr else ""
-        exit_code = -1
+        def drain(stream, buf):
+            # Keep reading to EOF even past the cap so the child never
+            # blocks on a full pipe while we wait for it to die
+            while True:
+                chunk = stream.read(1 << 16)
+                if not chunk:
+                    return
+                if len(buf) < cap:
+                    buf += chunk
+                    if len(buf) >= cap:
+                        proc.kill()  # Output cap blown - stop the child
+
+        readers = [threading.Thread(target=drain,
+                                    args=(proc.stdout, out_buf))]
+        if capture_stderr:
+            readers.append(threading.Thread(target=drain,
+                                            args=(proc.stderr, err_buf)))
+        for t in readers:
+            t.start()
+
+        try:
+            exit_code = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            proc.kill()
+            proc.wait()
+            exit_code = -1
+        for t in readers:
+            t.join()
+
+        stdout = bytes(out_buf[:cap]).decode('utf-8', 'replace')
+        stderr = bytes(err_buf[:cap]).decode('utf-8', 'replace')
 
     except Exception as e:
         stdout = ""
@@ -131,10 +195,9 @@ def shell(command: str, working_dir: str = None, timeout: int = 30,
     execution_time = time.time() - start
 
     # Truncate very long output
-    max_output = 1024 * 1024  # 1MB
-    if len(stdout) > max_output:
+    if len(stdout) > max_output or len(out_buf) >= cap:
         stdout = stdout[:max_output] + '\n[Output truncated at 1MB]'
-    if len(stderr) > max_output:
+    if len(stderr) > max_output or len(err_buf) >= cap:
         stderr = stderr[:max_output] + '\n[Output truncated at 1MB]'
 
     # Hint when commands fail due to missing dependencies
@@ -12,10 +12,60 @@ The security boundary is the user's decision to run ralph with network access.
 
 import html.parser
 import re
+import sys
 
 
 MAX_CONTENT_SIZE = 1024 * 1024  # 1MB
 
+# Fallback tag-stripping patterns, compiled once at module scope
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Tag classification sets, built once - the handle_* callbacks run per
+# tag on every page, so membership tests hit shared frozensets of
+# interned names (pointer-first equality) with no per-parser set
+# rebuilds and no self attribute load in the hot loop.
+# Only content-bearing elements may enter the skip counter: void tags
+# like <meta>/<link> never get a closing tag, so counting them left
+# current_skip stuck above zero and dropped the rest of the page (their
+# text content is empty anyway, so nothing needs skipping)
+_SKIP_TAGS = frozenset(map(sys.intern,
+                           ('script', 'style', 'head', 'noscript')))
+_BLOCK_TAGS = frozenset(map(sys.intern,
+                            ('p', 'div', 'br', 'li', 'tr',
+                             'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                             'article', 'section', 'header', 'footer',
+                             'nav', 'aside')))
+
+
+def _strip_regions(text: str, tag: str) -> str:
+    """Remove <tag ...>...</tag> regions with a linear two-pointer scan.
+
+    str.find cannot backtrack, so malformed or adversarial markup (an
+    unterminated <script>, say) costs O(n) instead of the catastrophic
+    backtracking a DOTALL '.*?' regex risks on this input.
+    """
+    lower = text.lower()
+    open_tag = '<' + tag
+    close_tag = '</' + tag + '>'
+    parts = []
+    prev = 0
+    while True:
+        i = lower.find(open_tag, prev)
+        if i == -1:
+            break
+        parts.append(text[prev:i])
+        j = lower.find(close_tag, i)
+        if j == -1:
+            # Unterminated region swallows the rest, as a browser would
+            prev = len(text)
+            break
+        prev = j + len(close_tag)
+    if not parts:
+        return text
+    parts.append(text[prev:])
+    return ''.join(parts)
+
 def web_fetch(url: str, timeout: int = 30) -> dict:
     """Fetch a web page and extract its text content (HTML tags stripped). Use for documentation lookups, API references, or checking web content. Content truncated at 1MB.
 
@@ -57,20 +107,33 @@ def web_fetch(url: str, timeout: int = 30) -> dict:
     if 'charset=' in content_type:
         charset = content_type.split('charset=')[-1].split(';')[0].strip()
 
-    # Re-encode with proper charset if not UTF-8
+    # Bound the work up front: a body far past the response cap would be
+    # charset-converted and HTML-parsed only to be thrown away below, so
+    # cut it to 2x the cap first (headroom for tags the conversion
+    # strips). The cut may land mid-tag; the parser tolerates a partial
+    # tail and the regex fallback is linear either way
+    truncated = False
     content = data
+    if len(content) > MAX_CONTENT_SIZE * 2:
+        content = content[:MAX_CONTENT_SIZE * 2]
+        truncated = True
+
+    # Re-encode with proper charset if not UTF-8
     if charset.lower() not in ('utf-8', 'utf8', ''):
         try:
-            content = data.encode('utf-8').decode(charset, errors='replace')
+            content = content.encode('utf-8').decode(charset, errors='replace')
         except (UnicodeDecodeError, LookupError):
             pass
 
-    # Convert HTML to plain text if it's HTML content
-    if 'html' in content_type.lower() or content.strip().startswith('<!DOCTYPE') or content.strip().startswith('<html'):
+    # Convert HTML to plain text if it's HTML content. Sniff only a
+    # bounded prefix - strip() on the full body would copy the whole
+    # megabyte just to check two leading tokens
+    head = content[:512].lstrip()
+    if ('html' in content_type.lower()
+            or head.startswith(('<!DOCTYPE', '<html'))):
         content = html_to_text(content)
 
     # Truncate very long content
-    truncated = False
     if len(content) > MAX_CONTENT_SIZE:
         content = content[:MAX_CONTENT_SIZE] + '\n[Content truncated at 1MB]'
         truncated = True
@@ -85,47 +148,77 @@ def web_fetch(url: str, timeout: int = 30) -> dict:
 
 
 class _HTMLTextExtractor(html.parser.HTMLParser):
-    """Simple HTML to text converter."""
+    """Simple HTML to text converter.
+
+    Whitespace is collapsed inline as fragments arrive: _sep holds the
+    separator owed before the next fragment (space, newline, or blank
+    line, upgraded by block boundaries and capped at a blank line), so
+    get_text is a single join with no regex passes over the full text.
+    Accumulation stops once the output cannot fit the response limit.
+    """
 
     def __init__(self):
         super().__init__()
         self.result = []
-        self.skip_tags = {'script', 'style', 'head', 'meta', 'link', 'noscript'}
-        self.block_tags = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-                          'article', 'section', 'header', 'footer', 'nav', 'aside'}
+        # Bound once - _emit runs per text fragment, and the bound
+        # method skips the LOAD_ATTR + LOAD_METHOD pair each append
+        self._append = self.result.append
         self.current_skip = 0
+        self._sep = ' '
+        self._size = 0
+        self._anchor_depth = 0
+
+    def _block_break(self):
+        # Runs of block boundaries cap at one blank line
+        if self._sep == ' ':
+            self._sep = '\n'
+        elif self._sep == '\n':
+            self._sep = '\n\n'
+
+    def _emit(self, text):
+        if self.result:
+            self._append(self._sep)
+            self._size += len(self._sep)
+        self._append(text)
+        self._size += len(text)
+        self._sep = ' '
 
     def handle_starttag(self, tag, attrs):
-        if tag in self.skip_tags:
+        if tag in _SKIP_TAGS:
             self.current_skip += 1
-        elif tag in self.block_tags and self.result:
-            self.result.append('\n')
+        elif tag in _BLOCK_TAGS:
+            self._block_break()
         elif tag == 'a':
-            # Try to extract href
+            # Mark linked text with brackets
             for name, value in attrs:
                 if name == 'href' and value and not value.startswith('#'):
-                    self.result.append(' [')
+                    self._emit('[')
+                    self._sep = ''
+                    self._anchor_depth += 1
+                    break
 
     def handle_endtag(self, tag):
-        if tag in self.skip_tags:
+        if tag in _SKIP_TAGS:
             self.current_skip = max(0, self.current_skip - 1)
-        elif tag in self.block_tags:
-            self.result.append('\n')
-        elif tag == 'a':
-            self.result.append('] ')
+        elif tag in _BLOCK_TAGS:
+            self._block_break()
+        elif tag == 'a' and self._anchor_depth:
+            self._anchor_depth -= 1
+            self._sep = ''
+            self._emit(']')
 
     def handle_data(self, data):
-        if self.current_skip == 0:
-            text = data.strip()
-            if text:
-                self.result.append(text + ' ')
+        cap = MAX_CONTENT_SIZE * 2
+        if self.current_skip or self._size > cap:
+            return
+        text = ' '.join(data.split())
+        if len(text) > cap - self._size:
+            text = text[:cap - self._size + 1]
+        if text:
+            self._emit(text)
 
     def get_text(self):
-        text = ''.join(self.result)
-        # Clean up whitespace
-        text = re.sub(r'\n\s*\n+', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
-        return text.strip()
+        return ''.join(self.result)
 
 
 def html_to_text(html_content: str) -> str:
@@ -136,8 +229,8 @@ def html_to_text(html_content: str) -> str:
         return parser.get_text()
     except Exception:
         # Fallback: strip tags with regex
-        text = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<[^>]+>', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+        text = _strip_regions(html_content, 'script')
+        text = _strip_regions(text, 'style')
+        text = _TAG_RE.sub(' ', text)
+        text = _WS_RE.sub(' ', text)
         return text.strip()
@@ -4,11 +4,69 @@ Gate: file_write
 Match: path
 """
 
+import functools
+import os
+import shutil
+import stat
+import time
+from pathlib import Path
+
+# Probed once at load time with the verified-IO entry points bound to
+# module globals - the per-call happy path is one None check plus direct
+# calls, no attribute lookups
+try:
+    import _ralph_verified_io
+    _vio_has_ctx = _ralph_verified_io.has_verified_context
+    _vio_get_path = _ralph_verified_io.get_resolved_path
+    _vio_match = _ralph_verified_io.path_matches
+    _vio_open = _ralph_verified_io.open_verified
+except ImportError:
+    _vio_has_ctx = None
+
 MAX_WRITE_SIZE = 50 * 1024 * 1024  # 50MB
 
 
+def _write_all(fd, data):
+    """Write data to a raw fd in full, honoring os.write's partial-write
+    contract. No buffered wrapper means the already-encoded bytes go to
+    the kernel without another copy."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _copy_backup(p, backup_path):
+    """Copy a file for backup, in-kernel where the platform allows.
+
+    os.copy_file_range never moves bytes through userspace and is
+    reflink-aware on CoW filesystems (btrfs/XFS copy zero bytes);
+    copystat restores the metadata copy2 would have preserved. Falls
+    back to copy2 where the syscall is missing or refuses the file.
+    """
+    try:
+        with open(p, 'rb') as src, open(backup_path, 'wb') as dst:
+            size = os.fstat(src.fileno()).st_size
+            copied = 0
+            while copied < size:
+                n = os.copy_file_range(src.fileno(), dst.fileno(),
+                                       size - copied)
+                if n == 0:
+                    break
+                copied += n
+        shutil.copystat(p, backup_path)
+    except (AttributeError, OSError):
+        shutil.copy2(p, backup_path)
+
+
+@functools.lru_cache(maxsize=1024)
 def _is_traversal_path(path: str) -> bool:
-    """Check if path contains directory traversal attempts."""
+    """Check if path contains directory traversal attempts.
+
+    Cached - agent loops hit the same handful of paths over and over
+    (read, patch, re-read), so repeat checks are a dict hit.
+    """
+    if '..' not in path:
+        return False
     parts = path.replace('\\', '/').split('/')
     return '..' in parts
 
@@ -25,11 +83,6 @@ def write_file(path: str, content: str, mode: str = "write", backup: bool = Fals
     Returns:
         Dictionary with success status and path
     """
-    from pathlib import Path
-    from datetime import datetime
-    import shutil
-    import os
-
     # Security check - prevent directory traversal
     if _is_traversal_path(path):
         raise ValueError("Invalid path: directory traversal not allowed")
@@ -49,54 +102,117 @@ def write_file(path: str, content: str, mode: str = "write", backup: bool = Fals
     # Try to use verified file I/O for TOCTOU-safe writes
     # This is available when approval gates have verified the path
     try:
-        import _ralph_verified_io
-        if _ralph_verified_io.has_verified_context():
+        if _vio_has_ctx is not None and _vio_has_ctx():
             # Use the resolved path from the verified context (not re-resolving)
-            verified_path = _ralph_verified_io.get_resolved_path()
-            if verified_path and _ralph_verified_io.path_matches(path):
+            verified_path = _vio_get_path()
+            if verified_path and _vio_match(path):
                 p = Path(verified_path)
                 # Create backup if requested and file exists
                 if backup and p.exists():
-                    timestamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
-                    backup_path = f"{p}.{timestamp}.bak"
-                    shutil.copy2(p, backup_path)
+                    # time_ns is unique past microsecond granularity with
+                    # no datetime allocation or strftime formatting
+                    backup_path = f"{p}.{time.time_ns()}.bak"
+                    if mode == "write":
+                        # Overwrite discards the old bytes anyway, so an
+                        # inode-level rename beats copying them first
+                        os.replace(p, backup_path)
+                    else:
+                        # Append still needs the original in place
+                        _copy_backup(p, backup_path)
                 # Create parent directories if needed
                 p.parent.mkdir(parents=True, exist_ok=True)
-                # Use the verified file context for atomic open
-                fd = _ralph_verified_io.open_verified(str(p), open_mode)
-                with os.fdopen(fd, open_mode, encoding='utf-8') as f:
-                    f.write(content)
+                # Use the verified file context for atomic open and
+                # write the already-encoded bytes straight to the fd -
+                # no text wrapper re-encoding, no buffered-writer copy
+                fd = _vio_open(str(p), open_mode)
+                try:
+                    _write_all(fd, content_bytes)
+                finally:
+                    os.close(fd)
                 return {
                     "success": True,
                     "path": str(p),
                     bytes_key: len(content_bytes),
                     "verified": True
                 }
-    except ImportError:
-        # Module not available - fall through to standard I/O
-        pass
     except OSError as e:
         # Verification failed - report the error
         raise OSError(f"File verification failed: {e}")
 
-    # Standard path resolution when verified context not available
-    p = Path(path).resolve()
-
-    # Create backup if requested and file exists (use unique timestamp-based name)
-    if backup and p.exists():
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
-        backup_path = f"{p}.{timestamp}.bak"
-        shutil.copy2(p, backup_path)
+    # Standard path resolution when verified context not available.
+    # Lexical only - abspath normalizes without realpath's per-component
+    # lstat walk, and traversal segments were already rejected above
+    if os.path.isabs(path) and '..' not in path and '/./' not in path:
+        p = Path(path)
+    else:
+        p = Path(os.path.abspath(path))
+
+    # Write through symlinks to their target, as an in-place open would:
+    # the tmp+replace swap below renames over the final component, which
+    # would otherwise replace the link itself with a regular file and
+    # leave its target stale. One lstat on the common non-link case
+    if os.path.islink(p):
+        p = Path(os.path.realpath(p))
+
+    # Capture the target's metadata before any rename moves it aside -
+    # the overwrite swap below creates a fresh inode and must carry the
+    # old mode/ownership over, as the baseline's in-place write did
+    try:
+        dst_st = os.stat(p)
+    except OSError:
+        dst_st = None
+
+    # Create backup if requested and file exists (unique time_ns suffix)
+    if backup and dst_st is not None:
+        backup_path = f"{p}.{time.time_ns()}.bak"
+        if mode == "write":
+            # Overwrite discards the old bytes anyway, so an inode-level
+            # rename beats copying them first
+            os.replace(p, backup_path)
+        else:
+            # Append still needs the original in place
+            _copy_backup(p, backup_path)
 
     # Create parent directories if needed
     p.parent.mkdir(parents=True, exist_ok=True)
 
-    # Fall back to standard file I/O (when gates disabled or no context)
+    # Fall back to standard file I/O (when gates disabled or no context).
+    # Raw writes of the already-encoded bytes - no second UTF-8 encode,
+    # no buffered-writer copy
     if mode == "append":
-        with open(p, 'a', encoding='utf-8') as f:
-            f.write(content)
+        fd = os.open(p, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            _write_all(fd, content_bytes)
+        finally:
+            os.close(fd)
     else:
-        p.write_text(content, encoding='utf-8')
+        # Crash-safe overwrite: write a sibling tmp file, fsync it, then
+        # atomically swap it in - a crash mid-write leaves the old file
+        # intact and readers never observe a half-written one
+        tmp = f"{p}.tmp.{os.getpid()}"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            try:
+                if dst_st is not None:
+                    # os.open's mode argument is masked by the umask;
+                    # fchmod restores the old permissions exactly.
+                    # Ownership is best-effort - only root may chown
+                    os.fchmod(fd, stat.S_IMODE(dst_st.st_mode))
+                    try:
+                        os.fchown(fd, dst_st.st_uid, dst_st.st_gid)
+                    except OSError:
+                        pass
+                _write_all(fd, content_bytes)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp, p)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
 
     return {
         "success": True,